@@ -1,7 +1,6 @@
 """ Controller for TSTools that handles slots/signals communication
 """
 import copy
-from datetime import datetime as dt
 from functools import partial
 import itertools
 import logging
@@ -119,13 +118,12 @@ class PlotHandler(QtCore.QObject):
                 # Switch based on plot type
                 if isinstance(event.canvas, plots.TSPlot):
                     _X, _y = tsm.ts.get_data(i, j, mask=False)
-                    _x = _X['ordinal']
+                    _x = plots.date2num(_X['date'])
                 elif isinstance(event.canvas, plots.ResidualPlot):
                     residuals = tsm.ts.get_residuals(i, j)
                     if residuals is None:
                         return
-                    _x = np.array([dt.toordinal(_d) for _d in
-                                   np.concatenate(residuals[0])])
+                    _x = plots.date2num(np.concatenate(residuals[0]))
                     _y = np.concatenate(residuals[1])
                 elif isinstance(event.canvas, plots.DOYPlot):
                     _X, _y = tsm.ts.get_data(i, j, mask=False)
@@ -182,18 +180,30 @@ class Controller(QtCore.QObject):
         """ Initialize timeseries selected by user
         """
         try:
-            tsm.ts = driver(location, config=custom_config)
+            ts = driver(location, config=custom_config)
         except Exception as e:
             msg = 'Failed to open timeseries: {msg}'.format(msg=e.message)
             qgis_log(msg, level=logging.ERROR, duration=5)
             raise  # TODO: REMOVE EXCEPTION
         else:
+            self.close_timeseries()
+            tsm.ts = ts
             qgis_log('Loaded timeseries: {d}'.format(d=tsm.ts.description))
             self.disconnect()
             self.config_closed()
             self._ts_init()
             self.initialized = True
 
+    def close_timeseries(self):
+        """ Close timeseries driver, if any, once it is no longer used
+        """
+        if getattr(tsm, 'ts', None) is None:
+            return
+        try:
+            tsm.ts.close()
+        except Exception as e:
+            logger.error('Error closing timeseries: %s' % e.message)
+
     def _ts_init(self):
         """ Initialize control and plot views with data from timeseries driver
         """
@@ -421,9 +431,8 @@ class Controller(QtCore.QObject):
         """
         for layer in layers:
             for i, series in enumerate(tsm.ts.series):
-                rows_added = [row for row, path in
-                              enumerate(series.images['path'])
-                              if layer.source() == path]
+                rows_added = np.where(
+                    series.images['path'] == layer.source())[0]
                 for row in rows_added:
                     logger.debug('Added image: {img}'.format(
                         img=series.images['id'][row]))
@@ -560,11 +569,14 @@ class Controller(QtCore.QObject):
         settings.plot_band_indices = []
         settings.plot_bands = []
         for i, series in enumerate(tsm.ts.series):
-            settings.plot_series.extend([i] * len(series.band_names))
-            settings.plot_band_indices.extend(range(len(series.band_names)))
+            # Include virtual bands (e.g., neighborhood statistics), if any
+            band_names = (list(series.band_names) +
+                          list(getattr(series, 'virtual_band_names', [])))
+            settings.plot_series.extend([i] * len(band_names))
+            settings.plot_band_indices.extend(range(len(band_names)))
             settings.plot_bands.extend(['%s - %s' %
                                         (series.description, name) for
-                                        name in series.band_names])
+                                        name in band_names])
         settings.plot_series = np.asarray(settings.plot_series)
         settings.plot_band_indices = np.asarray(settings.plot_band_indices)
         settings.plot_bands = np.asarray(settings.plot_bands)
@@ -578,10 +590,10 @@ class Controller(QtCore.QObject):
         # Default min/max on plot
         settings.plot['y_min'] = [0, 0]  # TODO:HARDCODE
         settings.plot['y_max'] = [10000, 10000]  # TODO:HARDCODE
-        settings.plot['x_min'] = min([series.images['date'].min()
-                                      for series in tsm.ts.series]).year
-        settings.plot['x_max'] = max([series.images['date'].max()
-                                      for series in tsm.ts.series]).year
+        settings.plot['x_min'] = int(min([series.images['year'].min()
+                                          for series in tsm.ts.series]))
+        settings.plot['x_max'] = int(max([series.images['year'].max()
+                                          for series in tsm.ts.series]))
 
         # Default mask values and fit/break on/off
         settings.plot['mask_val'] = tsm.ts.mask_values.copy()
@@ -420,8 +420,8 @@ class ControlPanel(QtGui.QWidget, Ui_Controls):
                 _cbox.setTextAlignment(QtCore.Qt.AlignHCenter |
                                        QtCore.Qt.AlignVCenter)
 
-                _date = QtGui.QTableWidgetItem(
-                    series.images['date'][row].strftime('%Y-%j'))
+                _date = QtGui.QTableWidgetItem('%i-%03i' % (
+                    series.images['year'][row], series.images['doy'][row]))
                 _date.setFlags(QtCore.Qt.ItemIsEnabled)
                 _date.setTextAlignment(QtCore.Qt.AlignHCenter |
                                        QtCore.Qt.AlignVCenter)
@@ -21,7 +21,8 @@ def series_to_csv(fname, series,
         writer = csv.writer(fid)
         header = ['Date'] + series.band_names
         writer.writerow(header)
-        for d, obs in itertools.izip(series.images['date'], series.data.T):
+        dates = series.images['date'].astype(object)
+        for d, obs in itertools.izip(dates, series.data.T):
             row = [d.strftime(date_format)] + [fmt % o for o in obs]
             writer.writerow(row)
 
@@ -1,5 +1,6 @@
 """ Plots available in TSTools
 """
+from .base_plot import date2num
 from .plot_doy import DOYPlot
 from .plot_ts import TSPlot
 from .plot_residuals import ResidualPlot
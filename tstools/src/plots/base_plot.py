@@ -5,6 +5,8 @@ import os
 import matplotlib as mpl
 from matplotlib.backends.backend_qt4agg \
     import FigureCanvasQTAgg as FigureCanvas
+import matplotlib.dates as mdates
+import numpy as np
 HAS_STYLE = True
 try:
     import matplotlib.style
@@ -14,6 +16,32 @@ except ImportError:
 from .. import settings
 
 
+def date2num(dates):
+    """ Convert dates to matplotlib dates, all at once
+
+    Unlike ``matplotlib.dates.date2num``, dates are converted using NumPy
+    ``datetime64`` arithmetic instead of one by one.
+
+    Args:
+        dates (np.ndarray or iterable): dates as ``datetime64`` or
+            ``datetime.date``
+
+    Returns:
+        np.ndarray: dates as days since the matplotlib date epoch
+
+    """
+    dates = np.asarray(dates, dtype='datetime64[s]')
+    return (dates - _date_epoch()).astype(np.float64) / 86400.0
+
+
+def _date_epoch():
+    # matplotlib>=3.3 has a configurable epoch, while dates were days since
+    # 0001-01-01, plus one, in earlier versions
+    if hasattr(mdates, 'get_epoch'):
+        return np.datetime64(mdates.get_epoch(), 's')
+    return np.datetime64('0000-12-31T00:00:00', 's')
+
+
 # Note: FigureCanvas is also a QWidget
 class BasePlot(FigureCanvas):
     """ Base plot class for methods common to all subclass plots """
@@ -62,7 +62,7 @@ class DOYPlot(base_plot.BasePlot):
         if tsm.ts:
             yr_min, yr_max = float('inf'), float('-inf')
             for series in tsm.ts.series:
-                year = np.array([d.year for d in series.images['date']])
+                year = series.images['year']
                 if year.min() <= yr_min:
                     yr_min = year.min()
                 if year.max() >= yr_max:
@@ -98,7 +98,7 @@ class DOYPlot(base_plot.BasePlot):
                                    indices=index)
 
             doy = X['doy']
-            year = np.array([d.year for d in X['date']])
+            year = X['year']
 
             # Check for year range
             year_in = np.where((year >= settings.plot['x_min']) &
@@ -75,7 +75,7 @@ class ResidualPlot(base_plot.BasePlot):
             if idx.size == 0:
                 continue
 
-            axis.plot(resid_dates[idx], resid_values[idx],
+            axis.plot(base_plot.date2num(resid_dates[idx]), resid_values[idx],
                       marker=marker, color=color, markeredgecolor=color,
                       ls='', picker=settings.plot['picker_tol'])
 
@@ -83,9 +83,9 @@ class ResidualPlot(base_plot.BasePlot):
             breaks = tsm.ts.get_breaks(series, band)
             if breaks is not None:
                 bx = breaks[0]
-                for _bx in bx:
+                for _bx, _bx_num in zip(bx, base_plot.date2num(bx)):
                     idx = np.where(resid_dates == _bx)[0][0]
-                    axis.plot(_bx, resid_values[idx], 'ro',
+                    axis.plot(_bx_num, resid_values[idx], 'ro',
                               mec='r', mfc='none', ms=10, mew=5)
 
         if settings.plot['custom']:
@@ -108,8 +108,10 @@ class ResidualPlot(base_plot.BasePlot):
         self.axis_1.set_xlabel('Date')
         self.axis_1.set_ylabel(r'Residuals ($y - \hat{y}$)')
 
-        self.axis_1.set_xlim(dt.date(settings.plot['x_min'], 1, 1),
-                             dt.date(settings.plot['x_max'], 12, 31))
+        self.axis_1.xaxis_date()
+        self.axis_1.set_xlim(base_plot.date2num([
+            dt.date(settings.plot['x_min'], 1, 1),
+            dt.date(settings.plot['x_max'], 12, 31)]))
 
         # Add 0 line
         self.axis_1.axhline(y=0, xmin=0, xmax=1, c='k')
@@ -64,7 +64,7 @@ class TSPlot(base_plot.BasePlot):
                                    indices=index)
 
             color = [c / 255.0 for c in color]
-            axis.plot(X['date'], y,
+            axis.plot(base_plot.date2num(X['date']), y,
                       marker=marker, color=color, markeredgecolor=color,
                       ls='',
                       picker=settings.plot['picker_tol'])
@@ -74,12 +74,12 @@ class TSPlot(base_plot.BasePlot):
             if predict is not None:
                 px, py = predict[0], predict[1]
                 for _px, _py in zip(px, py):
-                    axis.plot(_px, _py, linewidth=2)
+                    axis.plot(base_plot.date2num(_px), _py, linewidth=2)
 
         if settings.plot['break']:
             breaks = tsm.ts.get_breaks(series, band)
             if breaks is not None:
-                bx, by = breaks[0], breaks[1]
+                bx, by = base_plot.date2num(breaks[0]), breaks[1]
                 for _bx, _by in zip(bx, by):
                     axis.plot(_bx, _by, 'ro',
                               mec='r', mfc='none', ms=10, mew=5)
@@ -105,8 +105,10 @@ class TSPlot(base_plot.BasePlot):
         self.axis_1.set_xlabel('Date')
         self.axis_1.set_ylabel('Value')  # TODO
 
-        self.axis_1.set_xlim(dt.date(settings.plot['x_min'], 1, 1),
-                             dt.date(settings.plot['x_max'], 12, 31))
+        self.axis_1.xaxis_date()
+        self.axis_1.set_xlim(base_plot.date2num([
+            dt.date(settings.plot['x_min'], 1, 1),
+            dt.date(settings.plot['x_max'], 12, 31)]))
 
         self.axis_1.set_ylim(settings.plot['y_min'][0],
                              settings.plot['y_max'][0])
@@ -0,0 +1,844 @@
+""" Cache backends for timeseries drivers
+
+Example usage for migrating existing pixel caches to a pack file cache::
+
+    python -m tstools.ts_driver.cache /data/p013r030 --delete
+"""
+from __future__ import print_function
+
+import argparse
+from collections import OrderedDict
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+import numpy as np
+try:
+    from queue import Full, Queue
+except ImportError:
+    from Queue import Full, Queue
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from . import ts_utils
+
+logger = logging.getLogger('tstools')
+
+
+class CacheIndex(object):
+    """ In-memory index of the filenames within a cache folder
+
+    The folder is listed once when the index is created, so that checking
+    for a cache entry does not require a call to the file system. Cache
+    entries written by this process should be added using ``add``. Entries
+    written by other processes are found by calling ``refresh``, or
+    periodically by polling the modification time of the folder using
+    ``start_polling``. Pixel cache filenames are also indexed by the pixel
+    location they are named for (see ``at``).
+
+    Args:
+        cache_folder (str): path to cache folder
+
+    """
+    _location = re.compile(r'(x\d+_y\d+_)n\d+_b\d+')
+
+    def __init__(self, cache_folder):
+        self.cache_folder = cache_folder
+        self._lock = threading.Lock()
+        self._names = set()
+        self._locations = {}  # location: set of names
+        self._mtime = None
+        self._polling = None
+        self.refresh()
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(list(self._names))
+
+    def add(self, name):
+        """ Add a filename written to the cache folder """
+        with self._lock:
+            self._names.add(name)
+            location = self._locate(name)
+            if location:
+                self._locations.setdefault(location, set()).add(name)
+
+    def discard(self, name):
+        """ Remove a filename deleted from the cache folder """
+        with self._lock:
+            self._names.discard(name)
+            names = self._locations.get(self._locate(name))
+            if names is not None:
+                names.discard(name)
+
+    def at(self, location):
+        """ Return filenames of pixel caches named for a pixel location
+
+        Args:
+            location (str): pixel location, formatted as ``x{col}_y{row}_``
+
+        Returns:
+            list: filenames of pixel caches of ``location``
+
+        """
+        with self._lock:
+            return list(self._locations.get(location, ()))
+
+    def refresh(self):
+        """ List the cache folder again if it has been modified """
+        try:
+            mtime = os.stat(self.cache_folder).st_mtime
+            if mtime == self._mtime:
+                return
+            names = set(os.listdir(self.cache_folder))
+        except OSError as e:
+            logger.debug('Could not index cache folder %s: %s' %
+                         (self.cache_folder, e))
+            return
+        locations = {}
+        for name in names:
+            location = self._locate(name)
+            if location:
+                locations.setdefault(location, set()).add(name)
+        with self._lock:
+            self._names, self._mtime = names, mtime
+            self._locations = locations
+
+    def start_polling(self, interval):
+        """ Refresh index in a background thread every ``interval`` seconds
+        """
+        if self._polling is not None:
+            return
+        self._polling = threading.Event()
+        thread = threading.Thread(target=self._poll,
+                                  args=(interval, self._polling))
+        thread.daemon = True
+        thread.start()
+
+    def stop_polling(self):
+        """ Stop refreshing index in the background """
+        if self._polling is not None:
+            self._polling.set()
+            self._polling = None
+
+    def _poll(self, interval, stopped):
+        while not stopped.wait(interval):
+            self.refresh()
+
+    def _locate(self, name):
+        match = self._location.search(name)
+        return match.group(1) if match else None
+
+
+class CacheManager(object):
+    """ Keep the pixel and line caches in a cache folder within a size limit
+
+    The size and time of last access of each cache file are recorded in a
+    sidecar file within the cache folder (``CacheManager.sidecar``) instead
+    of relying on file access times, which are often not updated on shared
+    file systems. When the size of all cache files exceeds ``max_bytes``,
+    the least recently used cache files are deleted by a background thread
+    until the cache folder is within ``low_water`` of ``max_bytes``.
+
+    To avoid file system metadata requests on large (often remote) cache
+    folders, the cache folder is not listed and cache files are not checked
+    when the manager is created. Cache files not recorded in the sidecar
+    file are recorded once they are written or read (see ``add`` and
+    ``hit``). The sidecar file is only saved after evicting cache files and
+    when the manager is closed.
+
+    Pack caches are not managed, since pixels cannot be removed from them.
+
+    Args:
+        cache_folder (str): path to cache folder
+        max_bytes (int): maximum size of cache files, or 0 for no limit
+        index (CacheIndex, optional): index of cache folder, used to forget
+            cache files deleted since the sidecar file was saved and updated
+            when cache files are deleted
+        interval (float): seconds between checking if the cache folder is
+            over its size limit
+        low_water (float): fraction of ``max_bytes`` to evict down to
+
+    Attributes:
+        hits (int): number of queries read from cache
+        misses (int): number of queries not found in cache
+        evictions (int): number of cache files deleted
+
+    """
+    sidecar = '.tstools_cache.json'
+    extensions = ('.npz', '.npy')
+
+    def __init__(self, cache_folder, max_bytes=0, index=None, interval=60.0,
+                 low_water=0.9):
+        self.cache_folder = cache_folder
+        self.max_bytes = max(0, int(max_bytes))
+        self.index = index
+        self.interval = interval
+        self.low_water = low_water
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries = {}  # name: [size, last access]
+        self._usage = 0
+        self._dirty = False
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        self._load()
+
+    def __repr__(self):
+        return ('<CacheManager usage={u:.1f}/{m:.1f}MB files={n} '
+                'hit_ratio={r:.2f} evictions={e}>'.format(
+                    u=self._usage / 1e6, m=self.max_bytes / 1e6,
+                    n=len(self._entries), r=self.hit_ratio,
+                    e=self.evictions))
+
+    @property
+    def usage(self):
+        """ int: size, in bytes, of cache files """
+        return self._usage
+
+    @property
+    def hit_ratio(self):
+        """ float: fraction of queries read from cache """
+        n = self.hits + self.misses
+        return self.hits / float(n) if n else 0.0
+
+    def hit(self, name=None):
+        """ Record a query read from a cache file
+
+        Args:
+            name (str, optional): filename of cache file read from, if it is
+                managed
+
+        """
+        with self._lock:
+            self.hits += 1
+            entry = self._entries.get(name)
+            if entry is not None:
+                entry[1] = time.time()
+                self._dirty = True
+        if entry is None and name:
+            # Not yet recorded -- record it now that it is in use
+            self.add(name)
+
+    def miss(self):
+        """ Record a query not found in cache """
+        with self._lock:
+            self.misses += 1
+
+    def add(self, name, nbytes=None):
+        """ Record a cache file written to the cache folder
+
+        Args:
+            name (str): filename of cache file
+            nbytes (int, optional): size of cache file, if known
+
+        """
+        if not self._managed(name):
+            return
+        if nbytes is None:
+            try:
+                nbytes = os.path.getsize(os.path.join(self.cache_folder,
+                                                      name))
+            except OSError:
+                return
+        with self._lock:
+            old = self._entries.get(name)
+            if old is not None:
+                self._usage -= old[0]
+            self._entries[name] = [nbytes, time.time()]
+            self._usage += nbytes
+            self._dirty = True
+            over = self.max_bytes and self._usage > self.max_bytes
+        if over:
+            self._wake.set()
+
+    def discard(self, name):
+        """ Record a cache file deleted from the cache folder
+
+        Args:
+            name (str): filename of cache file
+
+        """
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is not None:
+                self._usage -= entry[0]
+                self._dirty = True
+
+    def evict(self):
+        """ Delete least recently used cache files until within size limit
+
+        Returns:
+            int: number of cache files deleted
+
+        """
+        if not self.max_bytes or self._usage <= self.max_bytes:
+            return 0
+
+        with self._lock:
+            target = self.max_bytes * self.low_water
+            lru = sorted(self._entries, key=lambda n: self._entries[n][1])
+            evict = []
+            for name in lru:
+                if self._usage <= target:
+                    break
+                self._usage -= self._entries.pop(name)[0]
+                evict.append(name)
+            self.evictions += len(evict)
+            self._dirty = True
+
+        for name in evict:
+            if self.index is not None:
+                self.index.discard(name)
+            try:
+                os.remove(os.path.join(self.cache_folder, name))
+            except OSError as e:
+                logger.debug('Could not evict cache file %s: %s' % (name, e))
+
+        logger.debug('Evicted {n} cache files: {m!r}'.format(n=len(evict),
+                                                              m=self))
+        return len(evict)
+
+    def start(self):
+        """ Evict cache files in the background
+        """
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        self._wake.set()
+
+    def close(self):
+        """ Stop the background thread and save the sidecar file
+        """
+        if self._thread is not None:
+            self._stopped.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.save()
+
+    def save(self):
+        """ Save the size and last access of cache files to the sidecar file
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict((name, list(entry)) for name, entry in
+                           self._entries.items())
+            self._dirty = False
+
+        filename = os.path.join(self.cache_folder, self.sidecar)
+        try:
+            write_atomic(filename, _write_json, entries)
+        except (IOError, OSError) as e:
+            logger.debug('Could not save cache sidecar file: %s' % e)
+
+    def _load(self):
+        try:
+            with open(os.path.join(self.cache_folder, self.sidecar)) as f:
+                saved = json.load(f)
+        except (IOError, OSError, ValueError):
+            saved = {}
+
+        for name, entry in saved.items():
+            # Forget cache files deleted since the sidecar was saved
+            if self.index is not None and name not in self.index:
+                self._dirty = True
+                continue
+            self._entries[name] = [int(entry[0]), float(entry[1])]
+            self._usage += int(entry[0])
+
+    def _managed(self, name):
+        # Hidden files are the sidecar and cache files being written
+        return name.endswith(self.extensions) and not name.startswith('.')
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                if self.evict():
+                    self.save()
+            except Exception as e:
+                logger.warning('Could not manage cache folder %s: %s' %
+                               (self.cache_folder, e))
+
+
+def replace(src, dst):
+    """ Rename ``src`` to ``dst``, replacing ``dst`` if it exists
+
+    Args:
+        src (str): filename to rename
+        dst (str): new filename
+
+    """
+    try:
+        os.replace(src, dst)
+    except AttributeError:
+        # Python 2 -- ``os.rename`` replaces existing files except on Windows
+        if os.name == 'nt' and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def _write_json(filename, obj):
+    with open(filename, 'w') as f:
+        json.dump(obj, f)
+
+
+def write_atomic(filename, write, *args):
+    """ Write a file using a temporary file that is renamed once written
+
+    The temporary file is hidden and keeps the extension of ``filename``, so
+    other readers never see a partially written file.
+
+    Args:
+        filename (str): filename to write
+        write (callable): function called with a filename and ``args`` that
+            writes the file (e.g., ``ts_utils.write_cache_pixel``)
+        args: additional arguments to ``write``
+
+    """
+    dirname, basename = os.path.split(filename)
+    tmp = os.path.join(dirname, '.%i.%i.%s' % (
+        os.getpid(), threading.current_thread().ident, basename))
+    try:
+        write(tmp, *args)
+        replace(tmp, filename)
+    except:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class FileLock(object):
+    """ An exclusive, advisory lock shared between processes
+
+    The lock is held on a lock file, which is removed when the lock is
+    released so that lock files do not accumulate. A process that acquires
+    the lock on a lock file removed while it waited tries again on a new
+    lock file. On platforms without ``fcntl`` (e.g., Windows) the lock does
+    nothing.
+
+    Args:
+        filename (str): filename of lock file
+
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self._f = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
+
+    def acquire(self, blocking=True):
+        """ Acquire the lock
+
+        Args:
+            blocking (bool): wait for the lock if it is held by another
+                process
+
+        Returns:
+            bool: True if the lock was acquired
+
+        """
+        if fcntl is None or self._f is not None:
+            return True
+        while True:
+            f = open(self.filename, 'a')
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else
+                            fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except (IOError, OSError):
+                f.close()
+                if blocking:
+                    raise
+                return False
+            # Holding the lock on a removed lock file does not exclude
+            # processes that open a new lock file
+            try:
+                current = os.stat(self.filename)
+            except OSError:
+                current = None
+            held = os.fstat(f.fileno())
+            if (current is not None and
+                    (current.st_dev, current.st_ino) ==
+                    (held.st_dev, held.st_ino)):
+                self._f = f
+                return True
+            f.close()
+
+    def release(self):
+        """ Release the lock and remove the lock file """
+        if self._f is not None:
+            try:
+                os.remove(self.filename)
+            except OSError:
+                pass
+            fcntl.flock(self._f, fcntl.LOCK_UN)
+            self._f.close()
+            self._f = None
+
+
+class CacheWriter(object):
+    """ Write to the cache from a background thread
+
+    Writes are queued and run in order by one thread so that they do not
+    delay reading data. If the queue is full, the write is skipped since a
+    cache is only an optimization.
+
+    Args:
+        maxsize (int): maximum number of queued writes
+
+    Attributes:
+        dropped (int): number of writes skipped because the queue was full
+
+    """
+    def __init__(self, maxsize=32):
+        self.dropped = 0
+        self._queue = Queue(maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, write, callback=None):
+        """ Queue a write
+
+        Args:
+            write (callable): function, called without arguments, that writes
+                to the cache (e.g., a ``functools.partial`` of
+                ``write_atomic``)
+            callback (callable, optional): function called without arguments
+                once ``write`` succeeds
+
+        Returns:
+            bool: True if the write was queued
+
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+        try:
+            self._queue.put_nowait((write, callback))
+        except Full:
+            self.dropped += 1
+            logger.debug('Cache write queue is full -- skipping write')
+            return False
+        return True
+
+    def flush(self):
+        """ Wait until all queued writes are complete """
+        self._queue.join()
+
+    def close(self):
+        """ Complete all queued writes and stop the background thread """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put((None, None))
+            thread.join()
+
+    def _run(self):
+        while True:
+            write, callback = self._queue.get()
+            try:
+                if write is None:
+                    return
+                write()
+                if callback is not None:
+                    callback()
+            except Exception as e:
+                logger.warning('Could not write to cache: %s' % e)
+            finally:
+                self._queue.task_done()
+
+
+class PixelLRU(object):
+    """ A bounded, in-memory, least recently used cache of pixel data
+
+    Args:
+        max_bytes (int): maximum size of data kept in memory
+
+    Attributes:
+        hits (int): number of requests found in memory
+        misses (int): number of requests not found in memory
+
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max(0, int(max_bytes))
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._data = OrderedDict()  # key: data, oldest first
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return ('<PixelLRU pixels={n} size={s:.1f}/{m:.1f}MB hits={h} '
+                'misses={mi}>'.format(n=len(self._data), s=self.nbytes / 1e6,
+                                      m=self.max_bytes / 1e6, h=self.hits,
+                                      mi=self.misses))
+
+    def get(self, key):
+        """ Return a copy of the data stored for ``key``, or None
+        """
+        with self._lock:
+            data = self._data.pop(key, None)
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._data[key] = data
+        return data.copy()
+
+    def put(self, key, data):
+        """ Store a copy of ``data`` for ``key``, evicting older data
+        """
+        if data.nbytes > self.max_bytes:
+            return
+        data = data.copy()
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._data[key] = data
+            self.nbytes += data.nbytes
+            while self.nbytes > self.max_bytes:
+                _, old = self._data.popitem(last=False)
+                self.nbytes -= old.nbytes
+
+    def clear(self):
+        """ Remove all data """
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+
+class PackCache(object):
+    """ Append-only cache of pixels for one Series stored in a single file
+
+    Pixels are stored back to back in one data file (``.dat``). A compact
+    index file (``.idx``) of (row, column, offset) records and a header
+    (``.json``) describing the data type, shape, and images of the Series
+    are stored alongside. The data file is memory mapped for reads. Writes
+    from many processes are serialized using a ``FileLock`` (``.lock``).
+
+    Args:
+        cache_folder (str): path to cache folder
+        series (Series): Series within timeseries driver to cache
+
+    Raises:
+        IndexError: raise IndexError if an existing pack file was written
+            for different images than those in ``series``
+
+    """
+    index_dtype = np.dtype([('row', '<u4'), ('col', '<u4'), ('offset', '<u8')])
+
+    def __init__(self, cache_folder, series):
+        name = ts_utils.name_cache_pack((series.count, series.n),
+                                        fingerprint=series.fingerprint)
+        base = os.path.join(cache_folder, name)
+        self.data_filename = base + '.dat'
+        self.index_filename = base + '.idx'
+        self.header_filename = base + '.json'
+        self.lock_filename = base + '.lock'
+
+        self.dtype = np.dtype(series.dtype)
+        self.shape = (series.count, series.n)
+        self.nbytes = self.dtype.itemsize * series.count * series.n
+
+        self._lock = threading.Lock()
+        self._mmap = None
+        self._init_header(series)
+        self.index = self._read_index()
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def read(self, row, col):
+        """ Return data for a pixel
+
+        Args:
+            row (int): row of pixel
+            col (int): column of pixel
+
+        Returns:
+            np.ndarray: 2D np.ndarray (nband x n) of data for pixel
+
+        Raises:
+            KeyError: raise KeyError if pixel is not in cache
+
+        """
+        offset = self.index[(row, col)]
+        with self._lock:
+            if self._mmap is None or offset + self.nbytes > self._mmap.size:
+                self._mmap = np.memmap(self.data_filename, dtype=np.uint8,
+                                       mode='r')
+            buf = self._mmap[offset:offset + self.nbytes]
+        return buf.view(self.dtype).reshape(self.shape).copy()
+
+    def write(self, row, col, data):
+        """ Append data for a pixel
+
+        Args:
+            row (int): row of pixel
+            col (int): column of pixel
+            data (np.ndarray): 2D np.ndarray (nband x n) of data for pixel
+
+        """
+        data = np.ascontiguousarray(data, dtype=self.dtype)
+        if data.shape != self.shape:
+            raise ValueError('Cannot cache data of shape %s in pack of shape '
+                             '%s' % (data.shape, self.shape))
+
+        with self._lock, FileLock(self.lock_filename):
+            with open(self.data_filename, 'ab') as f:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                data.tofile(f)
+            record = np.array([(row, col, offset)], dtype=self.index_dtype)
+            with open(self.index_filename, 'ab') as f:
+                # Drop any record partially written by an interrupted process
+                f.seek(0, os.SEEK_END)
+                extra = f.tell() % self.index_dtype.itemsize
+                if extra:
+                    f.truncate(f.tell() - extra)
+                record.tofile(f)
+            self.index[(row, col)] = offset
+
+    def _init_header(self, series):
+        header = {
+            'dtype': self.dtype.str,
+            'shape': list(self.shape),
+            'image_IDs': [str(_id) for _id in series.images['id']]
+        }
+        if os.path.isfile(self.header_filename):
+            with open(self.header_filename, 'r') as f:
+                existing = json.load(f)
+            if existing != header:
+                raise IndexError('Pack cache %s was not written for series '
+                                 '%s' % (self.data_filename,
+                                         series.description))
+        else:
+            write_atomic(self.header_filename, _write_json, header)
+
+    def _read_index(self):
+        if not os.path.isfile(self.index_filename):
+            return {}
+
+        with open(self.index_filename, 'rb') as f:
+            buf = f.read()
+        n = len(buf) // self.index_dtype.itemsize
+        records = np.frombuffer(buf[:n * self.index_dtype.itemsize],
+                                dtype=self.index_dtype)
+
+        # Ignore entries not completely written to data file
+        size = (os.path.getsize(self.data_filename)
+                if os.path.isfile(self.data_filename) else 0)
+        records = records[records['offset'] + self.nbytes <= size]
+
+        return dict((((int(r), int(c)), int(o)) for r, c, o in
+                     zip(records['row'], records['col'], records['offset'])))
+
+
+def migrate_npz(cache_folder, series, delete=False):
+    """ Copy pixel caches stored as NumPy zipped arrays into a pack cache
+
+    Args:
+        cache_folder (str): path to cache folder
+        series (Series): Series within timeseries driver
+        delete (bool): delete each pixel cache once migrated
+
+    Returns:
+        int: number of pixels migrated
+
+    """
+    pack = PackCache(cache_folder, series)
+    pattern = re.compile(
+        r'(?:%s|%s_)x(\d+)_y(\d+)_n%i_b%i(?:%s)?\.npz$' % (
+            re.escape(series.cache_prefix), series.fingerprint[:16],
+            series.n, series.count, re.escape(series.cache_suffix)))
+
+    n = 0
+    for fname in sorted(os.listdir(cache_folder)):
+        match = pattern.match(fname)
+        if not match:
+            continue
+        col, row = int(match.group(1)), int(match.group(2))
+        filename = os.path.join(cache_folder, fname)
+        if (row, col) not in pack:
+            try:
+                dat = ts_utils.read_cache_pixel(filename, series)
+            except Exception as e:
+                logger.warning('Could not migrate %s: %s' % (filename, e))
+                continue
+            pack.write(row, col, dat)
+            n += 1
+        if delete:
+            os.remove(filename)
+
+    return n
+
+
+def main(argv=None):
+    from .warm_cache import _parse_config, open_driver
+
+    parser = argparse.ArgumentParser(
+        description='Migrate pixel caches of a timeseries driver to pack '
+                    'cache files')
+    parser.add_argument('location', help='Root location of timeseries')
+    parser.add_argument('--driver', default='StackedTimeSeries',
+                        help='Timeseries driver (default: %(default)s)')
+    parser.add_argument('--config', action='append', metavar='KEY=VALUE',
+                        help='Replace a driver configuration value')
+    parser.add_argument('--delete', action='store_true',
+                        help='Delete pixel caches once migrated')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s:%(levelname)s: %(message)s')
+
+    driver = open_driver(args.driver, args.location,
+                         _parse_config(args.config))
+    cache_folder = os.path.join(args.location,
+                                driver.config['cache_folder'].value)
+    for series in driver.series:
+        n = migrate_npz(cache_folder, series, delete=args.delete)
+        logger.info('Migrated %i pixels of Series "%s"' %
+                    (n, series.description))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
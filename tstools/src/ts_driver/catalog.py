@@ -0,0 +1,225 @@
+""" A persistent catalog of the files and image attributes of a timeseries
+
+Opening a timeseries searches its location for images (and sometimes image
+metadata files) and opens an image of each Series with GDAL. A ``Catalog``
+stored with the data (in the cache folder of the timeseries) remembers the
+contents of each directory searched and values derived from files (e.g.,
+image attributes), so later searches only list directories whose
+modification time changed and values are only derived again for files that
+changed.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from . import ts_utils
+from .cache import _write_json, write_atomic
+
+logger = logging.getLogger('tstools')
+
+
+class Catalog(object):
+    """ Directory listings and file values of a location, kept on disk
+
+    Directory listings are reused while the directory's modification time
+    is unchanged, which is true until a file or directory is added to,
+    removed from, or renamed within it. Values stored for a file are
+    reused while the file's modification time is unchanged. Directories
+    and files modified within ``_RACY`` seconds of being cataloged are not
+    trusted, since they could change again without changing their
+    modification time. The catalog should not be stored in a directory
+    it searches, since writing it changes the directory.
+
+    Args:
+        folder (str): directory to store catalog in
+        filename (str): basename of catalog file within ``folder``
+
+    Attributes:
+        filename (str): filename of catalog
+        scanned (int): number of directories listed because they were not
+            in the catalog or had changed
+
+    """
+    _RACY = 2.0
+    _VERSION = 1
+
+    def __init__(self, folder, filename='.tstools_catalog.json'):
+        self.filename = os.path.join(folder, filename)
+        self.scanned = 0
+        self._dirs = {}  # directory: {'mtime', 'dirs', 'files'}
+        self._files = {}  # filename: {'mtime', key: value, ...}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def __repr__(self):
+        return '<Catalog {f} dirs={d} files={n} scanned={s}>'.format(
+            f=self.filename, d=len(self._dirs), n=len(self._files),
+            s=self.scanned)
+
+    def find_files(self, location, pattern, ignore_dirs=[],
+                   maxdepth=float('inf'), workers=8):
+        """ Find paths to files on disk matching an given pattern
+
+        Same as ``ts_utils.find_files``, but directories are only listed
+        if they are not cataloged or have changed since they were.
+
+        Args:
+            location (str): root directory to search
+            pattern (str): glob style pattern to search for
+            ignore_dirs (iterable): list of directories to ignore from search
+            maxdepth (int): maximum depth to recursively search
+            workers (int): number of directories to check concurrently
+
+        Returns:
+            list: list of files within location matching pattern
+
+        """
+        return list(self.iter_files(location, pattern,
+                                    ignore_dirs=ignore_dirs,
+                                    maxdepth=maxdepth, workers=workers))
+
+    def iter_files(self, location, pattern, ignore_dirs=[],
+                   maxdepth=float('inf'), workers=8):
+        """ Yield paths to files on disk matching an given pattern as found
+
+        Same as ``ts_utils.iter_files``, but directories are only listed
+        if they are not cataloged or have changed since they were.
+
+        Args:
+            location (str): root directory to search
+            pattern (str): glob style pattern to search for
+            ignore_dirs (iterable): list of directories to ignore from search
+            maxdepth (int): maximum depth to recursively search
+            workers (int): number of directories to check concurrently
+
+        Yields:
+            str: files within location matching pattern
+
+        """
+        return ts_utils.iter_files(location, pattern,
+                                   ignore_dirs=ignore_dirs,
+                                   maxdepth=maxdepth, workers=workers,
+                                   listdir=self._listdir)
+
+    def get(self, filename, key, default=None):
+        """ Return a value stored for a file, if the file is unchanged
+
+        Args:
+            filename (str): filename
+            key (str): name of value
+            default (object): value returned if no value is stored for
+                ``filename`` or if it changed since the value was stored
+
+        Returns:
+            object: value stored for ``filename``, or ``default``
+
+        """
+        entry = self._files.get(os.path.abspath(filename))
+        if entry is None or key not in entry:
+            return default
+        if entry['mtime'] is None or entry['mtime'] != _mtime(filename):
+            return default
+        return entry[key]
+
+    def set(self, filename, key, value):
+        """ Store a JSON serializable value for a file
+
+        Args:
+            filename (str): filename
+            key (str): name of value
+            value (object): value to store
+
+        """
+        filename = os.path.abspath(filename)
+        mtime = _mtime(filename)
+        with self._lock:
+            entry = self._files.get(filename)
+            if entry is None or entry['mtime'] != mtime:
+                entry = {'mtime': self._trusted(mtime)}
+                self._files[filename] = entry
+            entry[key] = value
+            self._dirty = True
+
+    def save(self):
+        """ Write the catalog, if it changed, ignoring unwritable locations
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            catalog = {
+                'version': self._VERSION,
+                'dirs': dict(self._dirs),
+                'files': dict(self._files)
+            }
+            self._dirty = False
+        try:
+            write_atomic(self.filename, _write_json, catalog)
+        except (IOError, OSError) as e:
+            logger.debug('Could not write catalog %s: %s' %
+                         (self.filename, e))
+
+    def _load(self):
+        try:
+            with open(self.filename, 'r') as f:
+                catalog = json.load(f)
+        except (IOError, OSError):
+            return
+        except ValueError as e:
+            logger.warning('Ignoring unreadable catalog %s: %s' %
+                           (self.filename, e))
+            return
+        if catalog.get('version') != self._VERSION:
+            return
+        self._dirs = catalog['dirs']
+        self._files = catalog['files']
+
+    def _listdir(self, root):
+        mtime = _mtime(root)
+        if mtime is None:
+            return [], []
+
+        with self._lock:
+            listing = self._dirs.get(root)
+        if listing is not None and listing['mtime'] == mtime:
+            return listing['dirs'], listing['files']
+
+        dirs, files = ts_utils.list_dir(root)
+        listing = {
+            'mtime': self._trusted(mtime),
+            'dirs': dirs,
+            'files': files
+        }
+
+        with self._lock:
+            self.scanned += 1
+            # Forget directories and files removed since the last listing
+            if root in self._dirs:
+                for name in set(self._dirs[root]['dirs']) - set(dirs):
+                    self._forget(os.path.join(root, name))
+            self._dirs[root] = listing
+            self._dirty = True
+
+        return dirs, files
+
+    def _forget(self, path):
+        # Caller must hold `self._lock`
+        prefix = path + os.path.sep
+        for entries in (self._dirs, self._files):
+            for key in [k for k in entries
+                        if k == path or k.startswith(prefix)]:
+                del entries[key]
+
+    def _trusted(self, mtime):
+        if mtime is None or time.time() - mtime < self._RACY:
+            return None
+        return mtime
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
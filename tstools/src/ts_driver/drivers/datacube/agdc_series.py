@@ -17,6 +17,7 @@ except ImportError:
     has_deps = False
 
 from ._vrt import VRT
+from ...image_table import ImageTable
 
 logger = logging.getLogger('tstools')
 
@@ -52,17 +53,7 @@ def collect_bands_across_datasets(datasets, bands):
 
 class AGDCSeries(object):
     description = 'Data Cube Time Series'
-    images = np.empty(
-        0,
-        dtype=[
-            ('filename', object),
-            ('path', object),
-            ('id', object),
-            ('date', object),
-            ('ordinal', 'u4'),
-            ('doy', 'u2')
-        ]
-    )
+    images = ImageTable()
     band_names = []
 
     symbology_hint_indices = [3, 2, 1]
@@ -114,21 +105,14 @@ class AGDCSeries(object):
         self.gt = ds.crs.attrs['GeoTransform']
         self.crs = ds.crs.attrs['crs_wkt']
 
-        _images = np.empty(self.n, dtype=self.images.dtype)
-        dtime = self.ds['time'].to_index().date
-        for i, (_tstamp, _dtime) in enumerate(zip(self.ds['time'], dtime)):
+        filenames, paths = [], []
+        for _tstamp in self.ds['time']:
             unix_tstamp = _tstamp.data.astype(np.int64) // 10**9
             # TODO: 'filename' is inaccessible w/o API
-            _images[i]['filename'] = str(_tstamp.data)
-            _images[i]['path'] = os.path.join(self.tmpdir,
-                                              str(unix_tstamp) + '.vrt')
-            # TODO: 'id' is inaccessible w/o API
-            _images[i]['id'] = str(_tstamp.data)
-            _images[i]['date'] = _dtime
-            _images[i]['ordinal'] = _dtime.toordinal()
-            _images[i]['doy'] = int(_dtime.strftime('%j'))
-
-        sort_idx = np.argsort(_images['ordinal'])
-        _images = _images[sort_idx]
-
-        self.images = _images.copy()
+            filenames.append(str(_tstamp.data))
+            paths.append(os.path.join(self.tmpdir, str(unix_tstamp) + '.vrt'))
+        dates = self.ds['time'].to_index().values
+
+        # TODO: 'id' is inaccessible w/o API
+        _images = ImageTable(filenames, paths, filenames, dates)
+        self.images = _images.take(np.argsort(_images['ordinal']))
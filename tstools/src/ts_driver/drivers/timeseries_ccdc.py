@@ -12,7 +12,7 @@ except:
     has_scipy = False
 
 from . import timeseries_stacked  # noqa
-from ..ts_utils import ConfigItem, find_files  # noqa
+from ..ts_utils import ConfigItem, find_files, ordinal_to_datetime64  # noqa
 from ... import settings  # noqa
 
 logger = logging.getLogger('tstools')
@@ -47,6 +47,9 @@ class CCDCTimeSeries(timeseries_stacked.StackedTimeSeries):
     # Driver configuration
     config = timeseries_stacked.StackedTimeSeries.config.copy()
     config['results_folder'] = ConfigItem('Results folder', 'TSFitMap')
+    # Results are only available for the bands of each image, not the
+    # virtual bands of a neighborhood
+    del config['window_size'], config['window_stat']
 
     def __init__(self, location, config=None):
         if not has_scipy:
@@ -128,8 +131,7 @@ class CCDCTimeSeries(timeseries_stacked.StackedTimeSeries):
 
             _my = np.dot(_coef, _mX[:_coef.size, :])
             # Transform ordinal back to datetime for plotting
-            _mx = np.array([dt.datetime.fromordinal(int(_x))
-                            for _x in _mx])
+            _mx = ordinal_to_datetime64(_mx)
 
             mx.append(_mx)
             my.append(_my)
@@ -150,6 +152,9 @@ class CCDCTimeSeries(timeseries_stacked.StackedTimeSeries):
         """
         if self.ccdc_results is None:
             return
+        if band >= self.series[series].count:
+            logger.debug('Not results for band %i' % band)
+            return
 
         # Setup output
         bx = []
@@ -160,8 +165,8 @@ class CCDCTimeSeries(timeseries_stacked.StackedTimeSeries):
         if len(self.ccdc_results) > 0:
             for rec in self.ccdc_results:
                 if rec['t_break'] != 0:
-                    _bx = dt.datetime.fromordinal(ml2ordinal(rec['t_break']))
-                    index = np.where(self.series[series].images['date'] ==
+                    _bx = ml2ordinal(rec['t_break'])
+                    index = np.where(self.series[series].images['ordinal'] ==
                                      _bx)[0]
                     if (index.size > 0 and index[0] < n_obs):
                         bx.append(_bx)
@@ -169,7 +174,7 @@ class CCDCTimeSeries(timeseries_stacked.StackedTimeSeries):
                     else:
                         logger.warning('Could not determine breakpoint')
 
-        return bx, by
+        return ordinal_to_datetime64(bx), by
 
     def get_residuals(self, series, band):
         """ Return model residuals (y - predicted yhat) for a given band
@@ -9,7 +9,7 @@ import patsy
 
 from .timeseries_yatsm import YATSMTimeSeries
 from ..series import Series
-from ..ts_utils import ConfigItem, find_files
+from ..ts_utils import ConfigItem
 
 logger = logging.getLogger('tstools')
 
@@ -40,7 +40,6 @@ class YATSMLandsatPALSARTS(YATSMTimeSeries):
     config['ps_date_format'] = ConfigItem('PALSAR date format', '%Y%m%d')
 
     # redefined
-    config['cache_folder'] = ConfigItem('Cache folder', 'cache_fusion')
     config['mask_band'] = ConfigItem('Mask band(s)', [8, 0, 0])
 
     def __init__(self, location, config=None):
@@ -51,6 +50,7 @@ class YATSMLandsatPALSARTS(YATSMTimeSeries):
 
         # Add series for RADAR HH/HV/ratio
         self._find_radar()
+        self._save_catalog()
 
     def fetch_data(self, mx, my, crs_wkt):
         """ Read data for a given x, y coordinate in a given CRS
@@ -86,7 +86,7 @@ class YATSMLandsatPALSARTS(YATSMTimeSeries):
             ignore_dirs.append(self.config['results_folder'].value)
 
         # Find HH images
-        hh_images = find_files(
+        hh_images = self._find_files(
             location,
             self.config['ps_stack_pattern'].value + '*hh.*tif',
             ignore_dirs=ignore_dirs)
@@ -101,11 +101,12 @@ class YATSMLandsatPALSARTS(YATSMTimeSeries):
                 'symbology_hint_indices': [0],
                 'symbology_hint_minmax': [-20, -2],
                 'band_names': ['HH']
-            }
+            },
+            catalog=self._catalog
         ))
 
         # Find HH/HV/Ratio VRT images
-        vrt_images = find_files(
+        vrt_images = self._find_files(
             location,
             self.config['ps_stack_pattern'].value + '*.vrt',
             ignore_dirs=ignore_dirs)
@@ -123,5 +124,6 @@ class YATSMLandsatPALSARTS(YATSMTimeSeries):
                     (-2.0, -10.0, 11.0)
                 ],
                 'band_names': ['HH', 'HV', 'HH/HV']
-            }
+            },
+            catalog=self._catalog
         ))
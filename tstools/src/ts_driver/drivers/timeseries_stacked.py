@@ -6,7 +6,10 @@ import os
 
 import numpy as np
 
-from ..ts_utils import find_files, ConfigItem
+from ..cache import CacheIndex, CacheManager, CacheWriter, PixelLRU
+from ..catalog import Catalog
+from ..reader import DatasetPool, default_max_open
+from ..ts_utils import iter_files, ConfigItem
 from ..series import Series
 from ..timeseries import AbstractTimeSeriesDriver
 from ...utils import geo_utils
@@ -39,22 +42,44 @@ class StackedTimeSeries(AbstractTimeSeriesDriver):
         ('date_format', ConfigItem('Date format', '%Y%j')),
         ('cache_folder', ConfigItem('Cache folder', 'cache')),
         ('mask_band', ConfigItem('Mask band', [8])),
+        ('max_open', ConfigItem('Max open images (0: file limit)', 0)),
+        ('read_workers', ConfigItem('Concurrent image reads', 4)),
+        ('window_size', ConfigItem('Neighborhood size', 1)),
+        ('window_stat', ConfigItem('Neighborhood statistic', 'mean')),
+        ('line_cache', ConfigItem('Read and cache entire rows', False)),
+        ('cache_format', ConfigItem('Cache format (npz or pack)', 'npz')),
+        ('cache_refresh', ConfigItem('Cache refresh interval (s)', 0)),
+        ('cache_max_size', ConfigItem('Cache size limit (MB)', 0)),
+        ('cache_manager', ConfigItem('Track cache usage', True)),
+        ('memory_cache_size', ConfigItem('Memory cache size (MB)', 64)),
+        ('catalog', ConfigItem('Catalog images on disk', True)),
     ))
 
     _read_cache, _write_cache = False, False
+    _cache_index = None
+    _cache_manager = None
+    _cache_writer = None
+    _memory = None
+    _catalog = None
 
     def __init__(self, location, config=None):
         super(StackedTimeSeries, self).__init__(location, config=config)
 
+        # Directory listings and image attributes are kept in a catalog,
+        # stored in the cache folder since it is not searched for images
+        if 'catalog' in self.config and self.config['catalog'].value:
+            self._catalog = Catalog(os.path.join(
+                self.location, self.config['cache_folder'].value))
+
         # Find images and init Series
         ignore_dirs = []
         if 'cache_folder' in self.config:
             ignore_dirs.append(self.config['cache_folder'].value)
         if 'results_folder' in self.config:
             ignore_dirs.append(self.config['results_folder'].value)
-        images = find_files(self.location,
-                            self.config['stack_pattern'].value,
-                            ignore_dirs=ignore_dirs)
+        images = self._iter_files(self.location,
+                                  self.config['stack_pattern'].value,
+                                  ignore_dirs=ignore_dirs)
 
         self.series = [
             Series(
@@ -67,9 +92,38 @@ class StackedTimeSeries(AbstractTimeSeriesDriver):
                     'symbology_hint_minmax': [[0, 4000], [0, 5000], [0, 3000]],
                     'cache_prefix': 'yatsm_',
                     'cache_suffix': '.npy'
-                })
+                },
+                catalog=self._catalog)
         ]
         self._check_cache()
+        self._save_catalog()
+
+        self._init_pool()
+        self._n_workers = (self.config['read_workers'].value
+                           if 'read_workers' in self.config else 1)
+        self._read_line = (self.config['line_cache'].value
+                           if 'line_cache' in self.config else False)
+        self._cache_format = (self.config['cache_format'].value
+                              if 'cache_format' in self.config else 'npz')
+        if self._cache_format not in ('npz', 'pack'):
+            raise ValueError('Unknown cache format "%s" (choose from npz or '
+                             'pack)' % self._cache_format)
+
+        # Pixels visited during this session are kept in memory
+        memory_size = (self.config['memory_cache_size'].value
+                       if 'memory_cache_size' in self.config else 0)
+        self._memory = PixelLRU(memory_size * 1e6) if memory_size > 0 else None
+
+        # Optionally read a neighborhood around each pixel
+        self._window_size = (self.config['window_size'].value
+                             if 'window_size' in self.config else 1)
+        if self._window_size < 1 or self._window_size % 2 == 0:
+            raise ValueError('Neighborhood size must be a positive, odd '
+                             'number (got %s)' % self._window_size)
+        if self._window_size > 1:
+            for series in self.series:
+                series.set_window(self._window_size,
+                                  self.config['window_stat'].value)
 
     @property
     def pixel_pos(self):
@@ -98,20 +152,42 @@ class StackedTimeSeries(AbstractTimeSeriesDriver):
         i = 0
         n = sum([len(series.images) for series in self.series])
 
-        descs, rowcol = [], []
-        for j, series in enumerate(self.series):
+        descs, rowcol, pixels = [], [], []
+        for series in self.series:
             _mx, _my = geo_utils.reproject_point(mx, my, crs_wkt, series.crs)
             _px, _py = geo_utils.point2pixel(_mx, _my, series.gt)
 
             descs.append(series.description)
             rowcol.append('%i/%i' % (_py, _px))
-
-            for _i in series.fetch_data(mx, my, crs_wkt,
-                                        cache_folder=cache_folder,
-                                        read_cache=self._read_cache,
-                                        write_cache=self._write_cache):
-                i += 1
-                yield i / float(n) * 100.0
+            pixels.append((_px, _py))
+
+        # Pixels visited earlier in this session are returned from memory
+        use_memory = self._memory is not None and self._window_size == 1
+        if not (use_memory and self._fetch_memory(pixels)):
+            for j, series in enumerate(self.series):
+                if self._window_size > 1:
+                    fetch = series.fetch_window(mx, my, crs_wkt,
+                                                pool=self._pool,
+                                                n_workers=self._n_workers)
+                else:
+                    fetch = series.fetch_data(
+                        mx, my, crs_wkt,
+                        cache_folder=cache_folder,
+                        read_cache=self._read_cache,
+                        write_cache=self._write_cache,
+                        pool=self._pool,
+                        n_workers=self._n_workers,
+                        read_line=self._read_line,
+                        cache_format=self._cache_format,
+                        cache_index=self._cache_index,
+                        cache_manager=self._cache_manager,
+                        cache_writer=self._cache_writer)
+                for _i in fetch:
+                    i += 1
+                    yield i / float(n) * 100.0
+
+                if use_memory:
+                    self._memory.put((j, series.px, series.py), series.data)
 
         # Collapse pixel position if same row/column
         pos = []
@@ -124,9 +200,97 @@ class StackedTimeSeries(AbstractTimeSeriesDriver):
 
         self._pixel_pos = 'Row/Col: ' + '; '.join(pos)
 
+        logger.debug('Dataset pool: {p!r}'.format(p=self._pool))
+        if self._memory is not None:
+            logger.debug('Memory cache: {m!r}'.format(m=self._memory))
+        if self._cache_manager is not None:
+            logger.debug('Cache: {c!r}'.format(c=self._cache_manager))
+
         # Update mask
         self.update_mask()
 
+    def _fetch_memory(self, pixels):
+        """ Set data of each Series from memory if all pixels are in memory
+
+        Args:
+          pixels (list): column and row of pixel for each Series
+
+        Returns:
+          bool: True if data for all Series were found in memory
+
+        """
+        data = []
+        for j, (_px, _py) in enumerate(pixels):
+            dat = self._memory.get((j, _px, _py))
+            if dat is None:
+                return False
+            data.append(dat)
+
+        for series, (_px, _py), dat in zip(self.series, pixels, data):
+            series.px, series.py = _px, _py
+            series.data = dat
+        logger.debug('Read pixel from memory')
+        return True
+
+    def fetch_points(self, points, crs_wkt):
+        """ Read data for many x, y coordinates in a given CRS
+
+        Each image is opened once for all points.
+
+        Args:
+          points (iterable): sequence of map (x, y) locations
+          crs_wkt (str): Well Known Text (Wkt) Coordinate reference system
+            string describing ``points``
+
+        Returns:
+          list: for each Series, a tuple of a 3D NumPy array
+            (npoint x nband x nimage) of data and a list of each point's
+            pixel geometry as Well Known Text (Wkt)
+
+        Raises:
+          IndexError: raise IndexError if any map coordinates are outside of
+            dataset
+
+        """
+        points = list(points)
+        return [series.fetch_points(points, crs_wkt,
+                                    pool=self._pool,
+                                    n_workers=self._n_workers)
+                for series in self.series]
+
+    def fetch_zonal(self, geom_wkt, crs_wkt, percentiles=(25, 75)):
+        """ Calculate statistics of data within a polygon for each image
+
+        Pixels are masked using the mask band and mask values used by
+        ``update_mask``.
+
+        Args:
+          geom_wkt (str): polygon as Well Known Text (Wkt)
+          crs_wkt (str): Well Known Text (Wkt) Coordinate reference system
+            string describing ``geom_wkt``
+          percentiles (iterable): percentiles to calculate
+
+        Returns:
+          list: for each Series, a dict of statistics for each band and image
+            named "mean", "median", and "p{percentile}" (2D np.ndarray,
+            nband x nimage), and number of valid pixels within polygon for
+            each image named "count" (1D np.ndarray)
+
+        Raises:
+          IndexError: raise IndexError if the polygon is outside of dataset
+
+        """
+        mask_bands = list(self.config['mask_band'].value)
+        mask_bands += [0] * (len(self.series) - len(mask_bands))
+
+        return [series.fetch_zonal(geom_wkt, crs_wkt,
+                                   mask_band=mask_band,
+                                   mask_values=self.mask_values,
+                                   percentiles=percentiles,
+                                   pool=self._pool,
+                                   n_workers=self._n_workers)
+                for mask_band, series in zip(mask_bands, self.series)]
+
     def fetch_results(self):
         """ Read or calculate results for current pixel """
         pass
@@ -151,6 +315,9 @@ class StackedTimeSeries(AbstractTimeSeriesDriver):
     def get_data(self, series, band, mask=True, indices=None):
         """ Return data for a given band
 
+        Bands beyond the number of bands in a Series are virtual bands
+        containing the neighborhood statistic of each band, if enabled.
+
         Args:
           series (int): index of Series containing data
           band (int or np.ndarray): index of band (int) or indices of bands
@@ -166,7 +333,10 @@ class StackedTimeSeries(AbstractTimeSeriesDriver):
         """
         X = self.series[series].images
         # y = self.series[series].data[band, :]
-        y = self.series[series].data.take(band, axis=0)
+        data = self.series[series].data
+        if np.any(np.asarray(band) >= data.shape[0]):
+            data = np.vstack((data, self.series[series].window_reduced))
+        y = data.take(band, axis=0)
 
         if mask is True:
             mask = self.series[series].mask
@@ -194,6 +364,19 @@ class StackedTimeSeries(AbstractTimeSeriesDriver):
     def get_residuals(self, series, band):
         pass
 
+    def close(self):
+        """ Finish cache writes, stop background threads, and release data
+        """
+        if self._cache_writer is not None:
+            self._cache_writer.close()
+        if self._cache_index is not None:
+            self._cache_index.stop_polling()
+        if self._cache_manager is not None:
+            self._cache_manager.close()
+        if self._memory is not None:
+            self._memory.clear()
+        self._pool.clear()
+
     def get_geometry(self):
         """ Return geometry and projection for data queried
 
@@ -238,3 +421,79 @@ class StackedTimeSeries(AbstractTimeSeriesDriver):
 
         logger.debug('Cache read/write: {r}/{w}'.format(
             r=self._read_cache, w=self._write_cache))
+
+        # List cache folder once instead of checking for each cache entry
+        if self._read_cache:
+            self._cache_index = CacheIndex(self.cache_folder)
+            refresh = (self.config['cache_refresh'].value
+                       if 'cache_refresh' in self.config else 0)
+            if refresh > 0:
+                self._cache_index.start_polling(refresh)
+            logger.debug('Indexed {n} cache entries'.format(
+                n=len(self._cache_index)))
+
+        # Write to cache in the background
+        if self._write_cache:
+            self._cache_writer = CacheWriter()
+
+        # Track cache usage and keep cache within size limit
+        manage = (self.config['cache_manager'].value
+                  if 'cache_manager' in self.config else True)
+        if self._read_cache and self._write_cache and manage:
+            max_size = (self.config['cache_max_size'].value
+                        if 'cache_max_size' in self.config else 0)
+            self._cache_manager = CacheManager(self.cache_folder,
+                                               max_bytes=max_size * 1e6,
+                                               index=self._cache_index)
+            self._cache_manager.start()
+            logger.debug('Cache: {c!r}'.format(c=self._cache_manager))
+
+    def _find_files(self, location, pattern, **kwargs):
+        """ Find files using the catalog, if there is one
+
+        Args:
+            location (str): root directory to search
+            pattern (str): glob style pattern to search for
+            kwargs: additional arguments to ``ts_utils.find_files``
+
+        Returns:
+            list: list of files within location matching pattern
+
+        """
+        return list(self._iter_files(location, pattern, **kwargs))
+
+    def _iter_files(self, location, pattern, **kwargs):
+        """ Yield files as found using the catalog, if there is one
+
+        Args:
+            location (str): root directory to search
+            pattern (str): glob style pattern to search for
+            kwargs: additional arguments to ``ts_utils.iter_files``
+
+        Returns:
+            iterator: files within location matching pattern
+
+        """
+        if self._catalog is not None:
+            return self._catalog.iter_files(location, pattern, **kwargs)
+        return iter_files(location, pattern, **kwargs)
+
+    def _save_catalog(self):
+        """ Write changes to the catalog, if there is one
+        """
+        if self._catalog is not None:
+            self._catalog.save()
+            logger.debug('Catalog: {c!r}'.format(c=self._catalog))
+
+    def _init_pool(self):
+        """ Create the pool of open image datasets shared by all Series
+
+        Unless a limit is configured, as many images as fit within the open
+        file limit of the process are kept open.
+        """
+        max_open = (self.config['max_open'].value
+                    if 'max_open' in self.config else 0)
+        if not max_open:
+            max_open = default_max_open(sum(s.n for s in self.series))
+        self._pool = DatasetPool(max_open)
+        logger.debug('Dataset pool: {p!r}'.format(p=self._pool))
@@ -1,7 +1,6 @@
 """ A basic timeseries driver for running YATSM on stacked timeseries
 """
 from collections import OrderedDict
-from datetime import datetime as dt
 import itertools
 import logging
 import os
@@ -14,7 +13,8 @@ import sklearn
 import sklearn.externals.joblib as jl
 
 from . import timeseries_stacked
-from ..ts_utils import ConfigItem, find_files, parse_landsat_MTL
+from ..ts_utils import (ConfigItem, ordinal_to_datetime64,
+                        parse_landsat_MTL)
 from ... import settings
 from ...logger import qgis_log
 
@@ -81,6 +81,14 @@ class YATSMTimeSeries(timeseries_stacked.StackedTimeSeries):
         ('metadata_file_pattern', ConfigItem('Metadata file pattern',
                                              'L*MTL.txt')),
         ('calc_pheno', ConfigItem('LTM phenology', False)),
+        ('max_open', ConfigItem('Max open images (0: file limit)', 0)),
+        ('read_workers', ConfigItem('Concurrent image reads', 4)),
+        ('cache_format', ConfigItem('Cache format (npz or pack)', 'npz')),
+        ('cache_refresh', ConfigItem('Cache refresh interval (s)', 0)),
+        ('cache_max_size', ConfigItem('Cache size limit (MB)', 0)),
+        ('cache_manager', ConfigItem('Track cache usage', True)),
+        ('memory_cache_size', ConfigItem('Memory cache size (MB)', 64)),
+        ('catalog', ConfigItem('Catalog images on disk', True)),
     ))
 
     # Driver controls
@@ -240,7 +248,7 @@ class YATSMTimeSeries(timeseries_stacked.StackedTimeSeries):
             # Predict
             _my = np.dot(_coef, _mX)
             # Transform ordinal back to datetime for plotting
-            _mx = np.array([dt.fromordinal(int(_x)) for _x in _mx])
+            _mx = ordinal_to_datetime64(_mx)
 
             mx.append(_mx)
             my.append(_my)
@@ -261,6 +269,9 @@ class YATSMTimeSeries(timeseries_stacked.StackedTimeSeries):
         """
         if self.yatsm_model is None:
             return
+        if band >= self.series[series].count:
+            logger.debug('Not results for band %i' % band)
+            return
         # Setup output
         bx = []
         by = []
@@ -268,8 +279,8 @@ class YATSMTimeSeries(timeseries_stacked.StackedTimeSeries):
         if len(self.yatsm_model.record) > 0:
             for rec in self.yatsm_model.record:
                 if rec['break'] != 0:
-                    _bx = dt.fromordinal(int(rec['break']))
-                    index = np.where(self.series[series].images['date'] ==
+                    _bx = int(rec['break'])
+                    index = np.where(self.series[series].images['ordinal'] ==
                                      _bx)[0]
                     if (index.size > 0 and
                             index[0] < self.series[series].data.shape[1]):
@@ -278,7 +289,7 @@ class YATSMTimeSeries(timeseries_stacked.StackedTimeSeries):
                     else:
                         logger.warning('Could not determine breakpoint')
 
-        return bx, by
+        return ordinal_to_datetime64(bx), by
 
     def get_residuals(self, series, band):
         """ Return model residuals (y - predicted yhat) for a given band
@@ -331,7 +342,7 @@ class YATSMTimeSeries(timeseries_stacked.StackedTimeSeries):
                 _x = (rec['start'] + rec['end']) / 2.0
                 _x, _y = self.get_prediction(series, band,
                                              dates=np.array([_x]))
-                _x = _x[0][0]
+                _x = _x[0][0].astype(object)
                 _y = _y[0][0] + 250
                 axis.text(_x, _y, 'RMSE: %.3f' % rec['rmse'][band],
                           fontsize=18,
@@ -401,7 +412,7 @@ class YATSMTimeSeries(timeseries_stacked.StackedTimeSeries):
                                 'sensor': self.series[0].sensor,
                                 'pr': self.series[0].pathrow})
         self._design_info = self.X.design_info.column_name_indexes
-        self.Y = self.series[0].data.astype(np.int16)
+        self.Y = self.series[0].data.astype(np.int16, copy=False)
         self.dates = np.asarray(self.series[0].images['ordinal'])
 
         mask = self.Y[self.config['mask_band'].value[0] - 1, :]
@@ -488,7 +499,7 @@ class YATSMTimeSeries(timeseries_stacked.StackedTimeSeries):
         # Find MTL file
         self.mtl_files = None
         if self.config['metadata_file_pattern'].value:
-            search = find_files(
+            search = self._find_files(
                 self.location, self.config['metadata_file_pattern'].value,
                 ignore_dirs=[self.config['results_folder'].value])
             if len(search) == 0:
@@ -531,14 +542,14 @@ class YATSMTimeSeries(timeseries_stacked.StackedTimeSeries):
             self.series[0].cloud_cover = np.ones(self.series[0].n) * -9999
             cloud_cover = {}
             for mtl_file in self.mtl_files:
-                attrs = parse_landsat_MTL(mtl_file, ['LANDSAT_SCENE_ID',
-                                                     'CLOUD_COVER'])
+                attrs = self._parse_MTL(mtl_file)
                 scene_ID = attrs.get('LANDSAT_SCENE_ID')
                 if scene_ID:
                     cloud_cover[scene_ID] = attrs.get('CLOUD_COVER', -9999.0)
 
             for idx, _id in enumerate(self.series[0].images['id']):
                 self.series[0].cloud_cover[idx] = cloud_cover.get(_id, -9999.0)
+            self._save_catalog()
 
         if self.config['calc_pheno'].value:
             self.series[0].metadata.append('pheno')
@@ -549,6 +560,19 @@ class YATSMTimeSeries(timeseries_stacked.StackedTimeSeries):
             self.series[0].pheno[0] = 'SPR'
             self.series[0].pheno[1] = 'AUT'
 
+    def _parse_MTL(self, mtl_file):
+        """ Return scene ID and cloud cover of MTL file, using the catalog
+        """
+        keys = ['LANDSAT_SCENE_ID', 'CLOUD_COVER']
+        if self._catalog is None:
+            return parse_landsat_MTL(mtl_file, keys)
+
+        attrs = self._catalog.get(mtl_file, 'mtl')
+        if attrs is None:
+            attrs = parse_landsat_MTL(mtl_file, keys)
+            self._catalog.set(mtl_file, 'mtl', attrs)
+        return attrs
+
 
 class MockResult(object):
     record = []
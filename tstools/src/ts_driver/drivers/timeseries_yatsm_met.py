@@ -5,7 +5,7 @@ import logging
 import os
 
 from .timeseries_yatsm import YATSMTimeSeries
-from ..ts_utils import ConfigItem, find_files
+from ..ts_utils import ConfigItem
 from ..series import Series
 from ...logger import qgis_log
 
@@ -37,7 +37,7 @@ class YATSMMetTimeSeries(YATSMTimeSeries):
 
         for met_type in self.config['met_types'].value:
             logger.debug('Finding met data: %s' % met_type)
-            images = find_files(
+            images = self._find_files(
                 os.path.join(self.config['met_location'].value, met_type),
                 self.config['met_pattern'].value)
 
@@ -68,8 +68,12 @@ class YATSMMetTimeSeries(YATSMTimeSeries):
                     'symbology_hint_indices': [0],
                     'cache_prefix': 'met_%s_' % met_type,
                     'cache_suffix': '.npy'
-                }
+                },
+                catalog=self._catalog
             )
             if met_type in min_max_symbology:
                 series.symbology_hint_minmax = min_max_symbology[met_type]
             self.series.append(series)
+
+        self._save_catalog()
+        self._init_pool()
@@ -0,0 +1,251 @@
+""" Compact, columnar tables describing the images of a Series
+"""
+import numbers
+
+import numpy as np
+
+from . import ts_utils
+
+if str is bytes:  # Python 2
+    def _encode(s):
+        return s if isinstance(s, bytes) else s.encode('utf-8')
+
+    def _decode(b):
+        return b
+else:
+    def _encode(s):
+        return s.encode('utf-8')
+
+    def _decode(b):
+        return b.decode('utf-8')
+
+
+class StringColumn(object):
+    """ A column of strings stored as offsets into one buffer
+
+    Each distinct string is stored once, encoded as UTF-8, in one buffer.
+    Rows store the index (or "code") of their string, so selecting rows only
+    copies integer codes and never creates Python strings. Codes are
+    assigned in sorted order of the distinct strings, so sorting codes
+    sorts strings.
+
+    Args:
+        strings (iterable): strings of each row
+
+    Attributes:
+        codes (np.ndarray): index of distinct string of each row
+
+    """
+    def __init__(self, strings=()):
+        strings = list(strings)
+        if strings:
+            distinct, codes = np.unique(strings, return_inverse=True)
+            encoded = [_encode(s) for s in distinct.tolist()]
+        else:
+            codes, encoded = [], []
+        self.codes = np.asarray(codes, dtype=np.int32).ravel()
+        self._buffer = b''.join(encoded)
+        self._offsets = np.cumsum([0] + [len(b) for b in encoded],
+                                  dtype=np.int64)
+
+    @classmethod
+    def _from_codes(cls, column, codes):
+        new = cls.__new__(cls)
+        new.codes = codes
+        new._buffer = column._buffer
+        new._offsets = column._offsets
+        return new
+
+    def __len__(self):
+        return self.codes.size
+
+    def __iter__(self):
+        for code in self.codes:
+            yield self._value(code)
+
+    def __getitem__(self, key):
+        if isinstance(key, numbers.Integral):
+            return self._value(self.codes[key])
+        return self._from_codes(self, self.codes[key])
+
+    def __contains__(self, value):
+        code = self._code(value)
+        return code is not None and bool(np.any(self.codes == code))
+
+    def __eq__(self, value):
+        code = self._code(value)
+        if code is None:
+            return np.zeros(self.codes.size, dtype=np.bool)
+        return self.codes == code
+
+    def __ne__(self, value):
+        return ~(self == value)
+
+    __hash__ = None
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array(self.tolist(), dtype=dtype)
+
+    def __repr__(self):
+        return '<StringColumn n={n} distinct={d} nbytes={b}>'.format(
+            n=len(self), d=self._offsets.size - 1, b=self.nbytes)
+
+    @property
+    def nbytes(self):
+        """ int: bytes used by codes, offsets, and buffer """
+        return (self.codes.nbytes + self._offsets.nbytes +
+                len(self._buffer))
+
+    def astype(self, dtype):
+        """ Return strings as a NumPy array of a given data type
+
+        Args:
+            dtype (np.dtype): data type of array (e.g., ``str``)
+
+        Returns:
+            np.ndarray: strings of each row
+
+        """
+        return np.array(self.tolist()).astype(dtype)
+
+    def take(self, indices, axis=0):
+        """ Return a column of the rows at given indices
+
+        Args:
+            indices (np.ndarray): indices of rows
+            axis (int): axis to take rows along; must be 0
+
+        Returns:
+            StringColumn: selected rows, sharing this column's buffer
+
+        """
+        return self._from_codes(self, self.codes.take(indices, axis=axis))
+
+    def tolist(self):
+        """ Return strings of each row as a list """
+        return list(self)
+
+    def _value(self, code):
+        return _decode(self._raw(code))
+
+    def _raw(self, code):
+        return self._buffer[self._offsets[code]:self._offsets[code + 1]]
+
+    def _code(self, value):
+        # Binary search of distinct strings, which are sorted
+        try:
+            target = _encode(value)
+        except (AttributeError, UnicodeError):
+            return None
+        lo, hi = 0, self._offsets.size - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._raw(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._offsets.size - 1 and self._raw(lo) == target:
+            return lo
+        return None
+
+
+class ImageTable(object):
+    """ Attributes of the images of a Series, stored by column
+
+    Columns are accessed by name, like a NumPy structured array, and rows
+    are selected by indexing or ``take``:
+
+    * "filename" (StringColumn): basename of image
+    * "path" (StringColumn): filename of image
+    * "id" (StringColumn): image ID
+    * "date" (np.ndarray): acquisition date (``datetime64[D]``)
+    * "ordinal" (np.ndarray): ordinal date (``u4``)
+    * "doy" (np.ndarray): day of year (``u2``)
+    * "year" (np.ndarray): year (``u2``)
+
+    Args:
+        filenames (iterable): basenames of images
+        paths (iterable): filenames of images
+        ids (iterable): image IDs
+        dates (iterable): acquisition dates of images, as ``datetime64``
+            or ``datetime.date``
+
+    """
+    names = ('filename', 'path', 'id', 'date', 'ordinal', 'doy', 'year')
+
+    def __init__(self, filenames=(), paths=(), ids=(), dates=()):
+        days = np.asarray(dates, dtype='datetime64[D]').ravel()
+        years = days.astype('datetime64[Y]')
+        self._columns = {
+            'filename': StringColumn(filenames),
+            'path': StringColumn(paths),
+            'id': StringColumn(ids),
+            'date': days,
+            'ordinal': (days.astype(np.int64) +
+                        ts_utils.ORDINAL_EPOCH).astype('u4'),
+            'doy': ((days - years).astype(np.int64) + 1).astype('u2'),
+            'year': (years.astype(np.int64) + 1970).astype('u2')
+        }
+        if len(set(len(col) for col in self._columns.values())) > 1:
+            raise ValueError('Columns of ImageTable must be the same length')
+
+    @classmethod
+    def _from_columns(cls, columns):
+        new = cls.__new__(cls)
+        new._columns = columns
+        return new
+
+    def __len__(self):
+        return len(self._columns['date'])
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._columns[key]
+        if isinstance(key, numbers.Integral):
+            key = [key]
+        return self._from_columns(dict((name, col[key]) for name, col in
+                                       self._columns.items()))
+
+    def __repr__(self):
+        return '<ImageTable n={n} nbytes={b}>'.format(n=len(self),
+                                                      b=self.nbytes)
+
+    @property
+    def shape(self):
+        """ tuple: number of images, like a 1D NumPy array """
+        return (len(self), )
+
+    @property
+    def nbytes(self):
+        """ int: bytes used by all columns """
+        return sum(col.nbytes for col in self._columns.values())
+
+    def argsort(self):
+        """ Return indices sorting images by date, then filename and path
+
+        Returns:
+            np.ndarray: indices of images in sorted order
+
+        """
+        return np.lexsort((self._columns['path'].codes,
+                           self._columns['filename'].codes,
+                           self._columns['ordinal']))
+
+    def copy(self):
+        """ Return a copy of the table """
+        return self.take(np.arange(len(self)))
+
+    def take(self, indices, axis=0):
+        """ Return a table of the images at given indices
+
+        Args:
+            indices (np.ndarray): indices of images
+            axis (int): axis to take images along; must be 0
+
+        Returns:
+            ImageTable: selected images
+
+        """
+        return self._from_columns(dict(
+            (name, col.take(indices, axis=axis)) for name, col in
+            self._columns.items()))
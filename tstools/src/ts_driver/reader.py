@@ -1,9 +1,18 @@
 """ Functions and classes useful for reading remote sensing imagery in GDAL
 """
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
 import logging
+import os
+import re
+import threading
 
 import numpy as np
 from osgeo import gdal, gdal_array
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 logger = logging.getLogger('tstools')
 
@@ -11,19 +20,321 @@ gdal.AllRegister()
 gdal.UseExceptions()
 
 
-def read_pixel_GDAL(filename, x, y):
+class DatasetPool(object):
+    """ A bounded, thread-safe pool of open GDAL datasets
+
+    Datasets are checked out of the pool for exclusive use by one thread
+    and returned to the pool once the read is complete. Idle datasets are
+    kept open and, when the number of open datasets exceeds ``max_open``,
+    the most recently returned idle dataset is closed. Timeseries read
+    their images in the same order for every pixel, so evicting the least
+    recently used dataset would close each dataset just before it is read
+    again; evicting the most recently used keeps the first ``max_open``
+    images open instead.
+
+    Uncompressed images read without GDAL are kept open as memory maps
+    (see ``memmap``), which count toward ``max_open`` and are evicted once
+    no idle datasets remain to evict.
+
+    Args:
+        max_open (int, optional): maximum number of datasets (and therefore
+            file descriptors) kept open by the pool, or None to use
+            ``default_max_open()``
+
+    Attributes:
+        hits (int): number of requests served by an idle, open dataset
+        misses (int): number of requests that required opening a dataset
+        evictions (int): number of idle datasets closed to stay within
+            ``max_open``
+
+    """
+    def __init__(self, max_open=None):
+        if not max_open:
+            max_open = default_max_open()
+        self.max_open = max(1, int(max_open))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._idle = OrderedDict()  # (filename, serial): ds, oldest first
+        self._idle_keys = {}  # filename: [(filename, serial), ...]
+        self._maps = OrderedDict()  # filename: np.memmap, oldest first
+        self._n_open = 0
+        self._serial = 0
+
+    def __len__(self):
+        return self._n_open
+
+    def __repr__(self):
+        return ('<DatasetPool open={o}/{m} hits={h} misses={mi} '
+                'evictions={e}>'.format(o=self._n_open, m=self.max_open,
+                                        h=self.hits, mi=self.misses,
+                                        e=self.evictions))
+
+    @contextmanager
+    def open(self, filename):
+        """ Check out an open dataset for ``filename``
+
+        Args:
+            filename (str): filename to open
+
+        Yields:
+            gdal.Dataset: a dataset opened read-only, for use only within
+                the context
+
+        """
+        ds = self._checkout(filename)
+        try:
+            yield ds
+        finally:
+            self._checkin(filename, ds)
+
+    def memmap(self, layout):
+        """ Return an uncompressed image mapped into memory
+
+        Args:
+            layout (RawLayout): layout of image on disk (see ``raw_layout``)
+
+        Returns:
+            np.memmap: read-only 3D array of the image, shaped as stored on
+                disk (see ``memmap_raw``)
+
+        """
+        with self._lock:
+            arr = self._maps.pop(layout.filename, None)
+            if arr is not None:
+                self.hits += 1
+                self._maps[layout.filename] = arr
+                return arr
+            self.misses += 1
+
+        arr = memmap_raw(layout)
+        with self._lock:
+            if layout.filename not in self._maps:
+                self._n_open += 1
+            self._maps[layout.filename] = arr
+            self._evict()
+        return arr
+
+    def clear(self):
+        """ Close all idle datasets and memory maps in the pool
+        """
+        with self._lock:
+            self._n_open -= len(self._idle) + len(self._maps)
+            self._idle.clear()
+            self._idle_keys.clear()
+            self._maps.clear()
+
+    def _checkout(self, filename):
+        with self._lock:
+            keys = self._idle_keys.get(filename)
+            if keys:
+                self.hits += 1
+                return self._idle.pop(keys.pop())
+            self.misses += 1
+            self._n_open += 1
+            self._evict()
+
+        try:
+            return gdal.Open(filename, gdal.GA_ReadOnly)
+        except:
+            with self._lock:
+                self._n_open -= 1
+            raise
+
+    def _checkin(self, filename, ds):
+        with self._lock:
+            self._serial += 1
+            key = (filename, self._serial)
+            self._idle[key] = ds
+            self._idle_keys.setdefault(filename, []).append(key)
+            self._evict()
+
+    def _evict(self):
+        # Caller must hold `self._lock`
+        while self._n_open > self.max_open and (self._idle or self._maps):
+            if self._idle:
+                key, _ = self._idle.popitem(last=True)
+                self._idle_keys[key[0]].remove(key)
+            else:
+                self._maps.popitem(last=True)
+            self._n_open -= 1
+            self.evictions += 1
+
+
+def default_max_open(n_images=None, reserve=0.5):
+    """ Return a number of datasets to keep open within the file limit
+
+    Args:
+        n_images (int, optional): number of images that will be read, if
+            known. No more than ``n_images`` datasets are needed
+        reserve (float): fraction of the process's open file limit left for
+            other files (e.g., layers open in QGIS and cache files)
+
+    Returns:
+        int: maximum number of datasets to keep open
+
+    """
+    limit = 512  # C runtime default on Windows
+    if resource is not None:
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft != resource.RLIM_INFINITY:
+            limit = soft
+        else:
+            limit = 65536
+    max_open = max(1, int(limit * (1 - reserve)))
+    if n_images:
+        max_open = min(max_open, n_images)
+    return max_open
+
+
+# ENVI "data type" codes to NumPy data types
+ENVI_DTYPES = {
+    1: 'u1', 2: 'i2', 3: 'i4', 4: 'f4', 5: 'f8',
+    12: 'u2', 13: 'u4', 14: 'i8', 15: 'u8'
+}
+
+# Description of an uncompressed, band interleaved image on disk
+RawLayout = namedtuple('RawLayout', ['filename', 'dtype', 'interleave',
+                                     'bands', 'lines', 'samples', 'offset'])
+
+
+def read_envi_header(filename):
+    """ Returns the key/value pairs of an ENVI header file
+
+    Args:
+      filename (str): filename of ENVI header (.hdr) file
+
+    Returns:
+      dict: header values, as strings, for each lower case key
+
+    Raises:
+      ValueError: raise ValueError if file is not an ENVI header
+
+    """
+    with open(filename, 'r') as f:
+        text = f.read()
+    if not text.startswith('ENVI'):
+        raise ValueError('%s is not an ENVI header file' % filename)
+
+    header = {}
+    for key, value in re.findall(r'^\s*([^=\n]+?)\s*=\s*({[^}]*}|[^\n]*)',
+                                 text, re.MULTILINE):
+        header[key.lower()] = value.strip()
+    return header
+
+
+def raw_layout(filename):
+    """ Return the layout of an uncompressed ENVI image, if it is one
+
+    Args:
+      filename (str): filename of image
+
+    Returns:
+      RawLayout or None: layout of BSQ, BIL, or BIP image on disk, or None
+        if ``filename`` does not have an ENVI header or is not an
+        uncompressed image of a supported data type
+
+    """
+    for hdr in (filename + '.hdr', os.path.splitext(filename)[0] + '.hdr'):
+        if os.path.isfile(hdr):
+            break
+    else:
+        return None
+
+    try:
+        header = read_envi_header(hdr)
+        if int(header.get('file compression', 0)):
+            return None
+        dtype = np.dtype(ENVI_DTYPES[int(header['data type'])])
+        dtype = dtype.newbyteorder('>' if int(header.get('byte order', 0))
+                                   else '<')
+        layout = RawLayout(filename, dtype, header['interleave'].lower(),
+                           int(header['bands']), int(header['lines']),
+                           int(header['samples']),
+                           int(header.get('header offset', 0)))
+    except (IOError, KeyError, ValueError) as e:
+        logger.debug('Cannot read %s without GDAL: %s' % (filename, e))
+        return None
+
+    size = (layout.bands * layout.lines * layout.samples *
+            layout.dtype.itemsize)
+    if (layout.interleave not in ('bsq', 'bil', 'bip') or
+            os.path.getsize(filename) < layout.offset + size):
+        return None
+
+    return layout
+
+
+def memmap_raw(layout):
+    """ Map an uncompressed image into memory
+
+    Args:
+      layout (RawLayout): layout of image on disk (see ``raw_layout``)
+
+    Returns:
+      np.memmap: read-only 3D array of the image, shaped (nband x nline x
+        nsample) for BSQ, (nline x nband x nsample) for BIL, and (nline x
+        nsample x nband) for BIP images
+
+    """
+    nband, nline, nsample = layout.bands, layout.lines, layout.samples
+    shape = {
+        'bsq': (nband, nline, nsample),
+        'bil': (nline, nband, nsample),
+        'bip': (nline, nsample, nband)
+    }[layout.interleave]
+    return np.memmap(layout.filename, dtype=layout.dtype, mode='r',
+                     offset=layout.offset, shape=shape)
+
+
+def read_pixel_raw(layout, x, y, pool=None):
+    """ Reads in a pixel of data directly from an uncompressed image
+
+    Args:
+      layout (RawLayout): layout of image on disk (see ``raw_layout``)
+      x (int): column
+      y (int): row
+      pool (DatasetPool, optional): pool of open images to read from
+        instead of mapping ``layout.filename`` for this read alone
+
+    Returns:
+      np.ndarray: 1D array (nband) containing the pixel data
+
+    """
+    arr = memmap_raw(layout) if pool is None else pool.memmap(layout)
+    if layout.interleave == 'bsq':
+        dat = arr[:, y, x]
+    elif layout.interleave == 'bil':
+        dat = arr[y, :, x]
+    else:
+        dat = arr[y, x, :]
+
+    return dat.astype(layout.dtype.newbyteorder('='))
+
+
+def read_pixel_GDAL(filename, x, y, pool=None):
     """ Reads in a pixel of data from an images using GDAL
 
     Args:
       filename (str): filename to read from
       x (int): column
       y (int): row
+      pool (DatasetPool, optional): pool of open datasets to read from
+        instead of opening ``filename`` for this read alone
 
     Returns:
       np.ndarray: 1D array (nband) containing the pixel data
 
     """
-    ds = gdal.Open(filename, gdal.GA_ReadOnly)
+    if pool is None:
+        return _read_pixel(gdal.Open(filename, gdal.GA_ReadOnly), x, y)
+    with pool.open(filename) as ds:
+        return _read_pixel(ds, x, y)
+
+
+def _read_pixel(ds, x, y):
     dtype = gdal_array.GDALTypeCodeToNumericTypeCode(
         ds.GetRasterBand(1).DataType)
 
@@ -32,3 +343,73 @@ def read_pixel_GDAL(filename, x, y):
         dat[i] = ds.GetRasterBand(i + 1).ReadAsArray(x, y, 1, 1)
 
     return dat
+
+
+def read_pixels_GDAL(filename, x, y, pool=None):
+    """ Reads in many pixels of data from an image using GDAL
+
+    The image is opened once for all pixels. If the pixels are close
+    together, the window containing all of them is read at once.
+
+    Args:
+      filename (str): filename to read from
+      x (np.ndarray): columns
+      y (np.ndarray): rows
+      pool (DatasetPool, optional): pool of open datasets to read from
+        instead of opening ``filename`` for this read alone
+
+    Returns:
+      np.ndarray: 2D array (nband x npixel) containing the pixel data
+
+    """
+    if pool is None:
+        return _read_pixels(gdal.Open(filename, gdal.GA_ReadOnly), x, y)
+    with pool.open(filename) as ds:
+        return _read_pixels(ds, x, y)
+
+
+def _read_pixels(ds, x, y):
+    xoff, yoff = x.min(), y.min()
+    xsize, ysize = x.max() - xoff + 1, y.max() - yoff + 1
+
+    # Read the window if it isn't much larger than the pixels requested
+    if xsize * ysize <= max(x.size * 16, 256):
+        dat = ds.ReadAsArray(int(xoff), int(yoff), int(xsize), int(ysize))
+        dat = dat.reshape(ds.RasterCount, ysize, xsize)
+        return dat[:, y - yoff, x - xoff]
+
+    dat = np.empty((ds.RasterCount, x.size),
+                   dtype=gdal_array.GDALTypeCodeToNumericTypeCode(
+                       ds.GetRasterBand(1).DataType))
+    for i, (_x, _y) in enumerate(zip(x, y)):
+        dat[:, i] = ds.ReadAsArray(int(_x), int(_y), 1, 1).ravel()
+
+    return dat
+
+
+def read_window_GDAL(filename, x, y, xsize, ysize, pool=None):
+    """ Reads in a window of data from an image using GDAL
+
+    Args:
+      filename (str): filename to read from
+      x (int): column of upper left pixel
+      y (int): row of upper left pixel
+      xsize (int): number of columns to read
+      ysize (int): number of rows to read
+      pool (DatasetPool, optional): pool of open datasets to read from
+        instead of opening ``filename`` for this read alone
+
+    Returns:
+      np.ndarray: 3D array (nband x ysize x xsize) containing the window
+
+    """
+    if pool is None:
+        return _read_window(gdal.Open(filename, gdal.GA_ReadOnly),
+                            x, y, xsize, ysize)
+    with pool.open(filename) as ds:
+        return _read_window(ds, x, y, xsize, ysize)
+
+
+def _read_window(ds, x, y, xsize, ysize):
+    dat = ds.ReadAsArray(x, y, xsize, ysize)
+    return dat.reshape(ds.RasterCount, ysize, xsize)
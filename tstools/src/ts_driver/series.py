@@ -1,19 +1,30 @@
 """ Module for Series dataset container classes
 """
-from datetime import datetime as dt
+from functools import partial
 import logging
+from multiprocessing.pool import ThreadPool
 import os
+import re
 
 import numpy as np
 from osgeo import gdal, gdal_array
 
 from . import ts_utils
-from .reader import read_pixel_GDAL
+from .cache import FileLock, PackCache, write_atomic
+from .image_table import ImageTable
+from .reader import (raw_layout, read_pixel_GDAL, read_pixel_raw,
+                     read_pixels_GDAL, read_window_GDAL)
 from ..utils import geo_utils
 
 logger = logging.getLogger('tstools')
 
 
+_WINDOW_STATS = {
+    'mean': np.mean,
+    'median': np.median
+}
+
+
 class Series(object):
     """ A container class for timeseries driven by a TimeSeries driver
 
@@ -22,18 +33,26 @@ class Series(object):
         dictionary when instantiating the class.
 
     Args:
-        filenames (list): filenames for images to be included in the Series
+        filenames (iterable): filenames for images to be included in the
+            Series, which may be yielded as they are found (e.g., by
+            ``ts_utils.iter_files``)
         date_index (tuple): start and end index of an image filename or ID
             that contains the image's date
         date_format (str): format of date in an image's filename or ID
+        config (dict, optional): attributes to set on the Series
+        catalog (Catalog, optional): catalog used to read, and store, the
+            attributes of an image instead of opening it with GDAL
 
     Attributes:
         description (str): description of timeseries series
-        images (np.ndarray): NumPy structured array containing attributes for
-            all timeseries images. Structured array columns must include
-            "filename" (str), "path" (str), "id" (str), "date" (dt.Date), and
-            "ordinal" (int).
+        images (ImageTable): table containing attributes for all timeseries
+            images, with columns "filename" (str), "path" (str), "id" (str),
+            "date" (``datetime64[D]``), "ordinal" (int), and "doy" (int)
+        fingerprint (str): hash of the ordered image IDs and filenames,
+            band count, and data type, used to name and validate cache files
         band_names (iterable): list of names describing each band
+        data (np.ndarray): 2D array (nband x n) of data for the current
+            pixel, stored in the data type of the images (``dtype``)
 
         symbology_hint_indices (tuple): three band indices (RGB) used for
             default symbology
@@ -48,23 +67,35 @@ class Series(object):
         metadata_names (iterable): list of names of variables used for plot and
             image table metadata
 
-        cache_prefix (str): cache filename prefix
-        cache_suffix (str): cache filename suffix
+        cache_prefix (str): filename prefix of caches named by driver, which
+            are still read. Caches are now named by ``fingerprint``
+        cache_suffix (str): filename suffix of caches named by driver
+        raw_reads (bool): read pixels from uncompressed ENVI images directly
+            instead of through GDAL
+
+        window_size (int): width and height of neighborhood read by
+            ``fetch_window``
+        window_stat (str): spatial statistic ("mean" or "median") of
+            neighborhood made available as virtual bands, or '' for none
+        window_data (np.ndarray): 4D array (nband x n x rows x columns) of
+            neighborhood data read by ``fetch_window``
+        window_reduced (np.ndarray): 2D array (nband x n) of ``window_stat``
+            calculated for each band and date of ``window_data``
+        virtual_band_names (iterable): list of names describing each band
+            of ``window_reduced``
 
     Methods:
         fetch_data: read data for a given X/Y, yielding progress as percentage
+        fetch_window: read data for a neighborhood around a given X/Y,
+            yielding progress as percentage
+        fetch_points: read data for many X/Y at once
+        fetch_zonal: calculate statistics of data within a polygon
         get_geometry: return Well Known Text (Wkt) of geometry and projection
             of query specified by X/Y coordinate
 
     """
     description = 'Stacked Time Series'
-    images = np.empty(0,
-                      dtype=[('filename', object),
-                             ('path', object),
-                             ('id', object),
-                             ('date', object),
-                             ('ordinal', 'u4'),
-                             ('doy', 'u2')])
+    images = ImageTable()
     band_names = []
 
     # Basic symbology hints by default
@@ -80,24 +111,35 @@ class Series(object):
 
     cache_prefix = ''
     cache_suffix = ''
+    raw_reads = True
+
+    window_size = 1
+    window_stat = ''
+    window_data = None
+    window_reduced = None
+    virtual_band_names = []
 
     px, py = 0, 0
 
     def __init__(self, filenames, date_index=(9, 16), date_format='%Y%j',
-                 config=None):
+                 config=None, catalog=None):
         self.date_index = date_index
         self.date_format = date_format
-        self._init_images(filenames, date_index, date_format)
-        self.data = np.zeros((self.count, self.n), dtype=np.float)
-        self._scratch_data = np.zeros_like(self.data)
+        self._init_images(filenames, date_index, date_format, catalog)
+        self.data = np.zeros((self.count, self.n), dtype=self.dtype)
         self.mask = np.ones(self.n, dtype=np.bool)
+        self._raw_layouts = {}
+        self._packs = {}
 
         if config:
             self.__dict__.update(config)
 
     def fetch_data(self, mx, my, crs_wkt,
                    cache_folder='',
-                   read_cache=False, write_cache=False):
+                   read_cache=False, write_cache=False,
+                   pool=None, n_workers=1, read_line=False,
+                   cache_format='npz', cache_index=None,
+                   cache_manager=None, cache_writer=None):
         """ Read data for a given x, y coordinate in a given CRS
 
         Args:
@@ -108,6 +150,23 @@ class Series(object):
             cache_folder (str): path to cache folder
             read_cache (bool): allow reading from cache
             write_cache (bool): allow writing to cache
+            pool (DatasetPool, optional): pool of open datasets shared
+                within a timeseries driver
+            n_workers (int): number of images to read concurrently
+            read_line (bool): cache the entire row of each image instead
+                of the pixel. Rows are only read from images if
+                ``write_cache``, since reading a row is slower than reading
+                a pixel
+            cache_format (str): format of pixel caches, either "npz" for
+                one NumPy zipped array per pixel or "pack" for a
+                ``PackCache``
+            cache_index (CacheIndex, optional): index of filenames within
+                ``cache_folder`` used instead of checking for each cache
+                file on disk
+            cache_manager (CacheManager, optional): manager of cache folder
+                size to record cache hits, misses, and writes with
+            cache_writer (CacheWriter, optional): write to cache in the
+                background instead of before returning
 
         Yields:
             float: current retrieval progress (1 to n)
@@ -117,6 +176,7 @@ class Series(object):
                 dataset
 
         """
+        last_px, last_py = self.px, self.py
         mx, my = geo_utils.reproject_point(mx, my, crs_wkt, self.crs)
         self.px, self.py = geo_utils.point2pixel(mx, my, self.gt)
 
@@ -128,63 +188,554 @@ class Series(object):
         got_cache = False
         pixel = ts_utils.name_cache_pixel(self.px, self.py,
                                           self.data.shape,
-                                          prefix=self.cache_prefix,
-                                          suffix=self.cache_suffix)
+                                          fingerprint=self.fingerprint)
         pixel_fn = os.path.join(cache_folder, pixel)
+        legacy_pixel_fn = os.path.join(
+            cache_folder,
+            ts_utils.name_cache_pixel(self.px, self.py,
+                                      self.data.shape,
+                                      prefix=self.cache_prefix,
+                                      suffix=self.cache_suffix))
 
         line = ts_utils.name_cache_line(self.py,
                                         self.data.shape,
-                                        prefix=self.cache_prefix,
-                                        suffix=self.cache_suffix)
+                                        fingerprint=self.fingerprint)
         line_fn = os.path.join(cache_folder, line)
+        legacy_line_fn = os.path.join(
+            cache_folder,
+            ts_utils.name_cache_line(self.py,
+                                     self.data.shape,
+                                     prefix=self.cache_prefix,
+                                     suffix=self.cache_suffix))
+
+        pack = None
+        if cache_format == 'pack' and (read_cache or write_cache):
+            pack = self._pack_cache(cache_folder)
 
         i = 0
         # First try pixel cache
-        if read_cache and os.path.isfile(pixel_fn):
+        if read_cache and pack is not None and (self.py, self.px) in pack:
+            logger.debug('Read pixel from pack cache')
+            self.data = pack.read(self.py, self.px)
+            got_cache = True
+            if cache_manager is not None:
+                cache_manager.hit()
+            yield float(self.data.shape[1])
+
+        for fn in (pixel_fn, legacy_pixel_fn):
+            if (not read_cache or got_cache or
+                    not self._cache_exists(fn, cache_index)):
+                continue
             logger.debug('Trying to read pixel from cache')
             try:
-                dat = ts_utils.read_cache_pixel(pixel_fn, self)
+                dat = ts_utils.read_cache_pixel(fn, self)
             except Exception as e:
                 logger.warning('Could not read from cache file %s: %s' %
-                               (pixel_fn, e.message))
+                               (fn, e.message))
             else:
                 logger.debug('Read pixel from cache')
-                self.data = dat.astype(np.float)
+                self.data = dat.astype(self.dtype, copy=False)
                 got_cache = True
+                if cache_manager is not None:
+                    cache_manager.hit(os.path.basename(fn))
                 yield float(self.data.shape[1])
 
-        # If pixel cache fails, try line
-        if read_cache and os.path.isfile(line_fn) and not got_cache:
-            logger.debug('Trying to read line from cache')
-            try:
-                dat = ts_utils.read_cache_line(line_fn, self)
-            except Exception as e:
-                logger.warning('Could not read from cache file %s: %s' %
-                               (line_fn, e.message))
-            else:
-                logger.debug('Read line from cache')
-                self.data = dat[..., self.px].astype(np.float)
-                got_cache = True
-                yield float(self.data.shape[1])
+        # Only one process reads and caches a row at a time. Once the lock
+        # is acquired, check if the row was cached while waiting for it
+        read_row = read_line and write_cache
+        line_lock = None
+        if read_row and not got_cache:
+            line_lock = FileLock(os.path.join(cache_folder, '.%s.lock' % line))
+            line_lock.acquire()
+            if cache_index is not None and os.path.isfile(line_fn):
+                cache_index.add(line)
+
+        try:
+            # If pixel cache fails, try line
+            for fn in (line_fn, legacy_line_fn):
+                if (not read_cache or got_cache or
+                        not self._cache_exists(fn, cache_index)):
+                    continue
+                logger.debug('Trying to read line from cache')
+                try:
+                    dat = ts_utils.read_cache_line_pixel(fn, self, self.px)
+                except Exception as e:
+                    logger.warning('Could not read from cache file %s: %s' %
+                                   (fn, e.message))
+                else:
+                    logger.debug('Read line from cache')
+                    self.data = dat.astype(self.dtype, copy=False)
+                    got_cache = True
+                    if cache_manager is not None:
+                        cache_manager.hit(os.path.basename(fn))
+                    yield float(self.data.shape[1])
+
+            # Last resort -- read from images
+            if not got_cache:
+                if cache_manager is not None:
+                    cache_manager.miss()
+                todo, extended = None, None
+                if read_row:
+                    data = np.empty((self.count, self.n, self.width),
+                                    dtype=self.dtype)
+                    read = partial(read_window_GDAL, x=0, y=self.py,
+                                   xsize=self.width, ysize=1, pool=pool)
+                else:
+                    data = np.empty((self.count, self.n), dtype=self.dtype)
+                    read = partial(self._read_pixel, x=self.px, y=self.py,
+                                   pool=pool)
+                try:
+                    # Read only images missing from a cache of other images.
+                    # Without an index, finding them would list the folder
+                    if (read_cache and not read_row and
+                            cache_index is not None):
+                        extended = self._extend_cache(data, cache_folder,
+                                                      cache_index)
+                        if extended is not None:
+                            todo, extended = extended
+                            i = self.n - todo.size
+                            yield float(i)
+                    for i_img, dat in self._read_images(read, n_workers,
+                                                        indices=todo):
+                        data[:, i_img] = dat.reshape(data[:, i_img].shape)
+                        i += 1
+                        yield float(i)
+                except BaseException:
+                    # Cancelled or failed -- keep data from last complete read
+                    self.px, self.py = last_px, last_py
+                    raise
+
+                if read_row:
+                    line_data = data
+                    data = line_data[..., self.px].copy()
+                self.data = data
+
+            if write_cache and not got_cache:
+                if read_row:
+                    write = partial(write_atomic, line_fn,
+                                    ts_utils.write_cache_line, self, line_data)
+                    written = line
+                elif pack is not None:
+                    write = partial(pack.write, self.py, self.px, self.data)
+                    written = None
+                else:
+                    write = partial(write_atomic, pixel_fn,
+                                    ts_utils.write_cache_pixel, self,
+                                    self.data)
+                    written = pixel
+                done = partial(self._cache_written, written, cache_index,
+                               cache_manager, replaced=extended)
+
+                if cache_writer is not None and line_lock is None:
+                    cache_writer.submit(write, callback=done)
+                else:
+                    try:
+                        write()
+                    except Exception as e:
+                        logger.warning('Could not write to cache in %s: %s' %
+                                       (cache_folder, e.message))
+                    else:
+                        done()
+        finally:
+            if line_lock is not None:
+                line_lock.release()
+
+    def fetch_window(self, mx, my, crs_wkt, pool=None, n_workers=1):
+        """ Read a neighborhood around a given x, y coordinate in a given CRS
+
+        The neighborhood is ``window_size`` pixels wide, centered on the
+        pixel, and is clipped to the extent of the dataset. Each image is
+        read with one windowed read. ``data`` is set to the center pixel of
+        the neighborhood.
+
+        Args:
+            mx (float): map X location
+            my (float): map Y location
+            crs_wkt (str): Well Known Text (Wkt) Coordinate reference system
+                string describing (x, y)
+            pool (DatasetPool, optional): pool of open datasets shared
+                within a timeseries driver
+            n_workers (int): number of images to read concurrently
+
+        Yields:
+            float: current retrieval progress (1 to n)
 
-        # Last resort -- read from images
-        if not got_cache:
-            for i_img in range(self.n):
-                self._scratch_data[:, i_img] = (read_pixel_GDAL(
-                    self.images['path'][i_img], self.px, self.py)
-                    .astype(np.float))
-                i += 1
-                yield float(i)
+        Raises:
+            IndexError: raise IndexError if map coordinates are outside of
+                dataset
 
-                # Copy from scratch variable if it completes
-                np.copyto(self.data, self._scratch_data, 'unsafe')
+        """
+        last_px, last_py = self.px, self.py
+        mx, my = geo_utils.reproject_point(mx, my, crs_wkt, self.crs)
+        self.px, self.py = geo_utils.point2pixel(mx, my, self.gt)
 
-        if write_cache and not got_cache:
+        if (self.px < 0 or self.py < 0 or
+                self.px >= self.width or self.py >= self.height):
+            raise IndexError('Coordinate specific outside of dataset: '
+                             '%i/%i' % (self.px, self.py))
+
+        half = self.window_size // 2
+        x0, y0 = max(self.px - half, 0), max(self.py - half, 0)
+        x1 = min(self.px + half + 1, self.width)
+        y1 = min(self.py + half + 1, self.height)
+
+        cube = np.empty((self.count, self.n, y1 - y0, x1 - x0),
+                        dtype=self.dtype)
+        read = partial(read_window_GDAL, x=x0, y=y0,
+                       xsize=x1 - x0, ysize=y1 - y0, pool=pool)
+        try:
+            for i_img, dat in self._read_images(read, n_workers):
+                cube[:, i_img, ...] = dat
+                yield float(i_img + 1)
+        except BaseException:
+            # Cancelled or failed -- keep data from last complete read
+            self.px, self.py = last_px, last_py
+            raise
+
+        self.window_data = cube
+        self.data = cube[:, :, self.py - y0, self.px - x0].copy()
+        self.window_reduced = self._reduce_window(cube, self.window_stat)
+
+    def set_window(self, size, stat=''):
+        """ Configure neighborhood size and statistic used by fetch_window
+
+        Args:
+            size (int): width and height of neighborhood, which must be odd so
+                the neighborhood is centered on the pixel
+            stat (str): spatial statistic ("mean" or "median") of the
+                neighborhood to make available as virtual bands, or '' for
+                none
+
+        Raises:
+            ValueError: raise ValueError if ``size`` is not a positive, odd
+                number or if ``stat`` is not supported
+
+        """
+        if size < 1 or size % 2 == 0:
+            raise ValueError('Neighborhood size must be a positive, odd '
+                             'number (got %s)' % size)
+        if stat and stat not in _WINDOW_STATS:
+            raise ValueError('Unknown neighborhood statistic "%s" (choose '
+                             'from %s)' % (stat, ', '.join(_WINDOW_STATS)))
+        self.window_size = size
+        self.window_stat = stat
+        self.window_data, self.window_reduced = None, None
+        self.virtual_band_names = []
+        if stat:
+            self.window_reduced = np.zeros((self.count, self.n))
+            self.virtual_band_names = [
+                '%s (%ix%i %s)' % (name, size, size, stat)
+                for name in self.band_names
+            ]
+
+    def _reduce_window(self, cube, stat):
+        if not stat:
+            return None
+        cube = cube.reshape(cube.shape[0], cube.shape[1], -1)
+        return _WINDOW_STATS[stat](cube, axis=-1)
+
+    def fetch_points(self, points, crs_wkt, pool=None, n_workers=1):
+        """ Read data for many x, y coordinates in a given CRS
+
+        Each image is opened once and all requested pixels are read from it
+        before moving on to the next image. Unlike :meth:`fetch_data`, the
+        data are returned and the current pixel of the Series is unchanged.
+
+        Args:
+            points (iterable): sequence of map (x, y) locations
+            crs_wkt (str): Well Known Text (Wkt) Coordinate reference system
+                string describing ``points``
+            pool (DatasetPool, optional): pool of open datasets shared
+                within a timeseries driver
+            n_workers (int): number of images to read concurrently
+
+        Returns:
+            tuple: 3D np.ndarray (npoint x nband x n) of data and a list of
+                each point's pixel geometry as Well Known Text (Wkt). No
+                images are read if ``points`` is empty
+
+        Raises:
+            IndexError: raise IndexError if any map coordinates are outside
+                of dataset
+
+        """
+        points = list(points)
+        if not points:
+            return np.empty((0, self.count, self.n), dtype=self.dtype), []
+
+        points = geo_utils.reproject_points(points, crs_wkt, self.crs)
+        px, py = zip(*[geo_utils.point2pixel(mx, my, self.gt)
+                       for mx, my in points])
+        px, py = np.array(px), np.array(py)
+
+        outside = np.where((px < 0) | (py < 0) |
+                           (px >= self.width) | (py >= self.height))[0]
+        if outside.size:
+            raise IndexError('Coordinates specified outside of dataset: %s' %
+                             ', '.join('%i/%i' % (px[i], py[i])
+                                       for i in outside))
+
+        data = np.empty((px.size, self.count, self.n), dtype=self.dtype)
+        read = partial(read_pixels_GDAL, x=px, y=py, pool=pool)
+        for i_img, dat in self._read_images(read, n_workers):
+            data[..., i_img] = dat.T
+
+        geoms = [geo_utils.pixel_geometry(self.gt, _px, _py).ExportToWkt()
+                 for _px, _py in zip(px, py)]
+
+        return data, geoms
+
+    def fetch_zonal(self, geom_wkt, crs_wkt, mask_band=None,
+                    mask_values=None, percentiles=(25, 75),
+                    pool=None, n_workers=1):
+        """ Calculate statistics of data within a polygon for each image
+
+        The polygon is rasterized once to a mask of the window covering it
+        and each image is read with one windowed read. Pixels are within
+        the polygon if their centers are within the polygon.
+
+        Args:
+            geom_wkt (str): polygon as Well Known Text (Wkt)
+            crs_wkt (str): Well Known Text (Wkt) Coordinate reference system
+                string describing ``geom_wkt``
+            mask_band (int, optional): band (starting from 1) containing
+                mask values, or None to not mask data
+            mask_values (iterable, optional): values of ``mask_band`` to
+                exclude from statistics
+            percentiles (iterable): percentiles to calculate
+            pool (DatasetPool, optional): pool of open datasets shared
+                within a timeseries driver
+            n_workers (int): number of images to read concurrently
+
+        Returns:
+            dict: statistics for each band and image named "mean", "median",
+                and "p{percentile}" (2D np.ndarray, nband x n), and number of
+                valid pixels within polygon for each image named "count"
+                (1D np.ndarray). Statistics are NaN for images without valid
+                pixels
+
+        Raises:
+            IndexError: raise IndexError if the polygon is outside of dataset
+
+        """
+        geom = geo_utils.reproject_geometry(geom_wkt, crs_wkt, self.crs)
+        window = geo_utils.geometry_window(geom, self.gt,
+                                           self.width, self.height)
+        inside = geo_utils.rasterize_geometry(geom, self.gt, window)
+
+        stats = dict(
+            ('p%s' % q, np.full((self.count, self.n), np.nan))
+            for q in percentiles
+        )
+        stats['mean'] = np.full((self.count, self.n), np.nan)
+        stats['median'] = np.full((self.count, self.n), np.nan)
+        stats['count'] = np.zeros(self.n, dtype=np.uint32)
+
+        read = partial(read_window_GDAL, x=window[0], y=window[1],
+                       xsize=window[2], ysize=window[3], pool=pool)
+        for i_img, dat in self._read_images(read, n_workers):
+            dat = dat[:, inside]
+            if mask_band:
+                dat = dat[:, np.in1d(dat[mask_band - 1], mask_values,
+                                     invert=True)]
+            stats['count'][i_img] = dat.shape[1]
+            if dat.shape[1] == 0:
+                continue
+
+            stats['mean'][:, i_img] = dat.mean(axis=1)
+            stats['median'][:, i_img] = np.median(dat, axis=1)
+            for q in percentiles:
+                stats['p%s' % q][:, i_img] = np.percentile(dat, q, axis=1)
+
+        return stats
+
+    def _extend_cache(self, data, cache_folder, cache_index):
+        """ Fill data from a pixel cache written for other images, if any
+
+        Pixel caches of this pixel written before images were added to (or
+        removed from) the Series, including caches named by driver, are
+        found by their name. Images are matched by ID and date (or only by
+        ID for caches that do not store dates), and data for images in both
+        the cache and the Series are copied into ``data``. Caches are not
+        used if images cannot be matched uniquely.
+
+        Args:
+            data (np.ndarray): 2D array (nband x n) to fill
+            cache_folder (str): path to cache folder
+            cache_index (CacheIndex): index of filenames within
+                ``cache_folder``
+
+        Returns:
+            tuple or None: indices of images not found in a cache
+                (np.ndarray) and the filename of the cache within
+                ``cache_folder``, or None if no pixel cache was found
+
+        """
+        location = 'x%i_y%i_' % (self.px, self.py)
+        names = cache_index.at(location)
+        pattern = re.compile(r'^(?:[0-9a-f]{16}_|%s)%sn(\d+)_b%i(?:%s)?\.npz$'
+                             % (re.escape(self.cache_prefix), location,
+                                self.count, re.escape(self.cache_suffix)))
+        candidates = []
+        for name in names:
+            match = pattern.match(name)
+            if match:
+                candidates.append((int(match.group(1)), name))
+        if not candidates:
+            return None
+
+        ids = self.images['id'].tolist()
+        keys = dict((key, i) for i, key in
+                    enumerate(zip(ids, self.images['ordinal'].tolist())))
+        if len(keys) != self.n:
+            return None
+        if len(set(ids)) == self.n:
+            keys.update((_id, i) for i, _id in enumerate(ids))
+
+        # Try the cache with the most images first
+        for _, name in sorted(candidates, reverse=True):
             try:
-                ts_utils.write_cache_pixel(pixel_fn, self)
+                z = np.load(os.path.join(cache_folder, name))
+                image_IDs, Y = z['image_IDs'].tolist(), z['Y']
+                if 'ordinals' in z.files:
+                    image_IDs = list(zip(image_IDs, z['ordinals'].tolist()))
             except Exception as e:
-                logger.warning('Could not cache pixel to %s: %s' %
-                               (pixel_fn, e.message))
+                logger.debug('Could not read from cache file %s: %s' %
+                             (name, e))
+                continue
+            if len(set(image_IDs)) != len(image_IDs):
+                continue
+
+            src, dst = [], []
+            for i, key in enumerate(image_IDs):
+                if key in keys:
+                    src.append(i)
+                    dst.append(keys[key])
+            if not dst:
+                continue
+
+            data[:, dst] = Y[:, src]
+            todo = np.setdiff1d(np.arange(self.n), dst)
+            logger.debug('Extending cache file %s with %i images' %
+                         (name, todo.size))
+            return todo, name
+
+        return None
+
+    def _cache_written(self, name, cache_index=None, cache_manager=None,
+                       replaced=None):
+        """ Record a cache file written to the cache folder, if any
+
+        The pixel cache that was extended to write it, if any, is deleted.
+        """
+        if name:
+            if cache_index is not None:
+                cache_index.add(name)
+            if cache_manager is not None:
+                cache_manager.add(name)
+        if not replaced or replaced == name or cache_index is None:
+            return
+        cache_index.discard(replaced)
+        if cache_manager is not None:
+            cache_manager.discard(replaced)
+        try:
+            os.remove(os.path.join(cache_index.cache_folder, replaced))
+        except OSError as e:
+            logger.debug('Could not remove extended cache file %s: %s' %
+                         (replaced, e))
+
+    def _cache_exists(self, filename, cache_index=None):
+        """ Return True if a cache file exists, using an index if given
+        """
+        if cache_index is None:
+            return os.path.isfile(filename)
+        return os.path.basename(filename) in cache_index
+
+    def _pack_cache(self, cache_folder):
+        """ Return the pack cache of this Series in a cache folder, if any
+        """
+        if cache_folder not in self._packs:
+            try:
+                self._packs[cache_folder] = PackCache(cache_folder, self)
+            except Exception as e:
+                logger.warning('Could not use pack cache in %s: %s' %
+                               (cache_folder, e))
+                self._packs[cache_folder] = None
+        return self._packs[cache_folder]
+
+    def _read_pixel(self, path, x, y, pool=None):
+        """ Read a pixel directly from disk if possible, or using GDAL
+
+        Uncompressed ENVI (BSQ, BIL, or BIP) images matching the size, band
+        count, and data type of the Series are read without GDAL. The
+        layout of each image is determined once.
+
+        Args:
+            path (str): filename of image
+            x (int): column
+            y (int): row
+            pool (DatasetPool, optional): pool of open datasets and memory
+                maps
+
+        Returns:
+            np.ndarray: 1D array (nband) containing the pixel data
+
+        """
+        if self.raw_reads:
+            layout = self._raw_layouts.get(path, False)
+            if layout is False:
+                layout = raw_layout(path)
+                if layout and (
+                        (layout.samples, layout.lines, layout.bands) !=
+                        (self.width, self.height, self.count) or
+                        layout.dtype.newbyteorder('=') != self.dtype):
+                    layout = None
+                self._raw_layouts[path] = layout
+            if layout:
+                try:
+                    return read_pixel_raw(layout, x, y, pool=pool)
+                except (EnvironmentError, ValueError) as e:
+                    logger.debug('Reading %s with GDAL instead: %s' %
+                                 (path, e))
+                    self._raw_layouts[path] = None
+
+        return read_pixel_GDAL(path, x, y, pool=pool)
+
+    def _read_images(self, read, n_workers=1, indices=None):
+        """ Read from all images, optionally concurrently
+
+        Reads are I/O bound and GDAL releases the GIL while reading, so a
+        pool of threads can hide file system latency. Results are yielded
+        in date order regardless of the order reads complete.
+
+        Args:
+            read (callable): function reading data from an image given its
+                path
+            n_workers (int): number of images to read concurrently
+            indices (np.ndarray, optional): indices of images to read, or
+                None for all images
+
+        Yields:
+            tuple: index of image and data read from image
+
+        """
+        if indices is None:
+            indices = np.arange(self.n)
+        if not len(indices):
+            return
+        paths = self.images['path'][indices]
+
+        if n_workers <= 1:
+            for i_img, path in zip(indices, paths):
+                yield i_img, read(path)
+            return
+
+        workers = ThreadPool(min(n_workers, len(indices)))
+        try:
+            for i_img, dat in zip(indices, workers.imap(read, paths)):
+                yield i_img, dat
+        finally:
+            workers.terminate()
 
     def get_geometry(self):
         """ Return geometry and projection for data queried
@@ -198,7 +749,17 @@ class Series(object):
 
         return geom.ExportToWkt(), self.crs
 
-    def _init_images(self, images, date_index=[9, 16], date_format='%Y%j'):
+    def _init_images(self, images, date_index=[9, 16], date_format='%Y%j',
+                     catalog=None):
+        # Images may be yielded as they are found, so read the attributes
+        # of an image while the rest are found
+        filenames, attrs = [], None
+        for fname in images:
+            filenames.append(fname)
+            if attrs is None:
+                attrs = _image_attributes(fname, catalog)
+        images = filenames
+
         n = len(images)
         if n == 0:
             raise Exception('Cannot initialize a Series of 0 images')
@@ -207,63 +768,82 @@ class Series(object):
             logger.debug('Trying to initialize a Series of %i images' % self.n)
 
         # Extract images information
-        _images = np.empty(self.n, dtype=self.images.dtype)
-
-        for i, img in enumerate(images):
-            _images[i]['filename'] = os.path.basename(img)
-            _images[i]['path'] = img
-            _images[i]['id'] = os.path.basename(os.path.dirname(img))
-
-            try:
-                date = _images[i]['id'][date_index[0]:date_index[1]]
-                date = dt.strptime(date, date_format)
-            except:
-                try:
-                    date = _images[i]['filename'][date_index[0]:date_index[1]]
-                    date = dt.strptime(date, date_format)
-                except:
-                    raise Exception(
-                        'Could not parse date from ID or filename '
-                        '(date index=%s:%s, format=%s)\n%s\n%s' %
-                        (date_index[0], date_index[1], date_format,
-                         _images[i]['id'], _images[i]['filename'])
-                    )
-            _images[i]['date'] = date
-            _images[i]['ordinal'] = dt.toordinal(_images[i]['date'])
-            _images[i]['doy'] = int(_images[i]['date'].strftime('%j'))
-
-        sort_idx = np.argsort(_images, order='ordinal')
-        _images = _images[sort_idx]
-
-        self.images = _images.copy()
-
-        # Extract attributes
-        self.gt = None
-        self.crs = None
-        ds = None
-        for fname in images:
-            try:
-                ds = gdal.Open(fname, gdal.GA_ReadOnly)
-            except:
-                pass
-            else:
-                break
-        if ds is None:
+        filenames = [os.path.basename(img) for img in images]
+        ids = [os.path.basename(os.path.dirname(img)) for img in images]
+
+        # Parse dates from ID, or from filename if not in ID
+        date_slice = slice(date_index[0], date_index[1])
+        dates = ts_utils.parse_dates([_id[date_slice] for _id in ids],
+                                     date_format)
+        missing = np.where(ts_utils.isnat(dates))[0]
+        if missing.size:
+            dates[missing] = ts_utils.parse_dates(
+                [filenames[i][date_slice] for i in missing], date_format)
+            failed = missing[ts_utils.isnat(dates[missing])]
+            if failed.size:
+                raise Exception(
+                    'Could not parse date from ID or filename '
+                    '(date index=%s:%s, format=%s)\n%s\n%s' %
+                    (date_index[0], date_index[1], date_format,
+                     ids[failed[0]], filenames[failed[0]])
+                )
+
+        _images = ImageTable(filenames, images, ids, dates)
+        self.images = _images.take(_images.argsort())
+
+        if attrs is None:
             raise Exception('Could not initialize attributes for %s series: '
                             'could not open any images in Series with GDAL' %
                             self.description)
 
-        self.band_names = []
-        for i_b in range(ds.RasterCount):
-            name = ds.GetRasterBand(i_b + 1).GetDescription()
-            if not name:
-                name = 'Band %s' % str(i_b + 1)
-            self.band_names.append(name)
-
-        self.width = ds.RasterXSize
-        self.height = ds.RasterYSize
-        self.count = ds.RasterCount
-        self.dtype = gdal_array.GDALTypeCodeToNumericTypeCode(
-            ds.GetRasterBand(1).DataType)
-        self.gt = ds.GetGeoTransform()
-        self.crs = ds.GetProjection()
+        self.band_names = list(attrs['band_names'])
+        self.width = attrs['width']
+        self.height = attrs['height']
+        self.count = attrs['count']
+        self.dtype = np.dtype(attrs['dtype']).type
+        self.gt = tuple(attrs['gt'])
+        self.crs = attrs['crs']
+
+        # Caches are only shared by Series of the same images and bands
+        self.fingerprint = ts_utils.fingerprint_ids(
+            self.images['id'], filenames=self.images['filename'],
+            attributes=(self.count, np.dtype(self.dtype).name))
+
+
+def _image_attributes(filename, catalog=None):
+    """ Return attributes of an image, or None if GDAL cannot open it
+
+    Attributes are read from, and stored in, the catalog, if given.
+    """
+    if catalog is not None:
+        attrs = catalog.get(filename, 'attributes')
+        if attrs is not None:
+            return attrs
+
+    try:
+        ds = gdal.Open(filename, gdal.GA_ReadOnly)
+    except:
+        return None
+    if ds is None:
+        return None
+
+    band_names = []
+    for i_b in range(ds.RasterCount):
+        name = ds.GetRasterBand(i_b + 1).GetDescription()
+        if not name:
+            name = 'Band %s' % str(i_b + 1)
+        band_names.append(name)
+
+    attrs = {
+        'band_names': band_names,
+        'width': ds.RasterXSize,
+        'height': ds.RasterYSize,
+        'count': ds.RasterCount,
+        'dtype': np.dtype(gdal_array.GDALTypeCodeToNumericTypeCode(
+            ds.GetRasterBand(1).DataType)).name,
+        'gt': list(ds.GetGeoTransform()),
+        'crs': ds.GetProjection()
+    }
+    if catalog is not None:
+        catalog.set(filename, 'attributes', attrs)
+    return attrs
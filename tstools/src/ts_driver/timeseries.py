@@ -51,6 +51,12 @@ class AbstractTimeSeriesDriver(object):
     Extra Methods:
         set_custom_controls(values): setter for custom control variables
             defined in `controls`. Required to enable custom controls
+        fetch_points: read data for many X/Y at once, returning data and
+            geometry for each Series
+        fetch_zonal: calculate statistics of data within a polygon for each
+            Series
+        close: release resources (e.g., open files or background threads)
+            held by the driver once it is no longer used
 
     """
 
@@ -117,6 +123,54 @@ class AbstractTimeSeriesDriver(object):
         """
         pass
 
+    def fetch_points(self, points, crs_wkt):
+        """ Read data for many x, y coordinates in a given CRS
+
+        Args:
+            points (iterable): sequence of map (x, y) locations
+            crs_wkt (str): Well Known Text (Wkt) Coordinate reference system
+                string describing ``points``
+
+        Returns:
+            list: for each Series, a tuple of a 3D NumPy array
+                (npoint x nband x nimage) of data and a list of each point's
+                pixel geometry as Well Known Text (Wkt)
+
+        Raises:
+            NotImplementedError: raise NotImplementedError if driver does not
+                support batched reads
+
+        """
+        raise NotImplementedError('%s does not support reading many points '
+                                  'at once' % self.__class__.__name__)
+
+    def fetch_zonal(self, geom_wkt, crs_wkt, percentiles=(25, 75)):
+        """ Calculate statistics of data within a polygon for each image
+
+        Args:
+            geom_wkt (str): polygon as Well Known Text (Wkt)
+            crs_wkt (str): Well Known Text (Wkt) Coordinate reference system
+                string describing ``geom_wkt``
+            percentiles (iterable): percentiles to calculate
+
+        Returns:
+            list: for each Series, a dict of statistics for each band and
+                image (e.g., "mean", "median") and the number of valid pixels
+                within polygon for each image ("count")
+
+        Raises:
+            NotImplementedError: raise NotImplementedError if driver does not
+                support zonal statistics
+
+        """
+        raise NotImplementedError('%s does not support zonal statistics' %
+                                  self.__class__.__name__)
+
+    def close(self):
+        """ Release resources held by the driver once it is no longer used
+        """
+        pass
+
     @abc.abstractmethod
     def fetch_results(self):
         """ Read or calculate results for current pixel """
@@ -147,7 +201,8 @@ class AbstractTimeSeriesDriver(object):
                 no indexing
 
         Returns:
-            tuple: two 1D NumPy arrays containing dates (x) and data (y)
+            tuple: table of the images (X, an ``ImageTable``) and 1D NumPy
+                array of data (y)
 
         """
         pass
@@ -164,7 +219,7 @@ class AbstractTimeSeriesDriver(object):
 
         Returns:
             iterable: sequence of tuples (1D NumPy arrays, x and y) containing
-                predictions
+                predictions, with dates (x) as ``datetime64[D]``
 
         """
         pass
@@ -179,7 +234,7 @@ class AbstractTimeSeriesDriver(object):
 
         Returns:
             iterable: sequence of tuples (1D NumPy arrays, x and y) containing
-                break points
+                break points, with dates (x) as ``datetime64[D]``
 
         """
         pass
@@ -194,7 +249,7 @@ class AbstractTimeSeriesDriver(object):
 
         Returns:
             iterable: sequence of tuples (1D NumPy arrays, x and y) containing
-                residual dates and values
+                residual dates (as ``datetime64[D]``) and values
 
         """
         pass
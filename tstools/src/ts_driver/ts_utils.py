@@ -3,15 +3,20 @@
 from collections import namedtuple
 import datetime as dt
 import fnmatch
+import hashlib
 import logging
+from multiprocessing.pool import ThreadPool
 import os
 
 import numpy as np
 
 try:
-    from scandir import walk
+    from scandir import scandir
 except ImportError:
-    from os import walk
+    try:
+        from os import scandir
+    except ImportError:
+        scandir = None
 
 logger = logging.getLogger('tstools')
 
@@ -49,7 +54,7 @@ def check_cache(cache_folder):
     return (read_cache, write_cache)
 
 
-def name_cache_pixel(x, y, shape, prefix='', suffix=''):
+def name_cache_pixel(x, y, shape, prefix='', suffix='', fingerprint=None):
     """ Return a filename for a pixel cache file
 
     Args:
@@ -58,6 +63,10 @@ def name_cache_pixel(x, y, shape, prefix='', suffix=''):
         shape (tuple): shape of Y data to save
         prefix (str, optional): prefix to pixel cache filename
         suffix (str, optional): suffix to pixel cache filename
+        fingerprint (str, optional): fingerprint of Series image IDs. If
+            provided, the filename begins with the fingerprint instead of
+            ``prefix`` and ``suffix`` so that the cache is shared by all
+            drivers reading the same images
 
     Returns:
         str: cache filename
@@ -65,15 +74,19 @@ def name_cache_pixel(x, y, shape, prefix='', suffix=''):
     """
     f = 'x%s_y%s_n%s_b%s' % (x, y, shape[1], shape[0])
 
+    if fingerprint:
+        return fingerprint[:16] + '_' + f + '.npz'
     return prefix + f + suffix + '.npz'
 
 
-def write_cache_pixel(filename, series):
+def write_cache_pixel(filename, series, data=None):
     """ Save one series data to NumPy zipped array
 
     Args:
         filename (str): filename of cache file
         series (Series): Series within timeseries driver to save
+        data (np.ndarray, optional): 2D np.ndarray (nband x n) of data to
+            save instead of ``series.data``
 
     Raises:
         IOError: raise IOError if it cannot write to cache
@@ -81,8 +94,10 @@ def write_cache_pixel(filename, series):
     """
     logger.debug('Caching pixel to %s' % filename)
     np.savez(filename,
-             **{'Y': series.data,
-                'image_IDs': series.images['id']})
+             **{'Y': series.data if data is None else data,
+                'image_IDs': series.images['id'].astype(str),
+                'ordinals': series.images['ordinal'],
+                'fingerprint': np.array(series.fingerprint)})
 
 
 def read_cache_pixel(filename, series):
@@ -105,6 +120,9 @@ def read_cache_pixel(filename, series):
     if 'Y' not in z.files or 'image_IDs' not in z.files:
         raise IndexError('Cache file is not in the correct format')
 
+    if 'fingerprint' in z.files:
+        return _check_fingerprint(z, series)
+
     if np.array_equal(z['image_IDs'], series.images['id']):
         return z['Y']
     else:
@@ -112,24 +130,91 @@ def read_cache_pixel(filename, series):
                          'are not the same' % series.description)
 
 
-def name_cache_line(y, shape, prefix='', suffix=''):
+def name_cache_pack(shape, prefix='', suffix='', fingerprint=None):
+    """ Return a base filename (without extension) for a pack cache
+
+    Args:
+        shape (tuple): shape of Y data to save for each pixel
+        prefix (str, optional): prefix to pack cache filename
+        suffix (str, optional): suffix to pack cache filename
+        fingerprint (str, optional): fingerprint of Series image IDs. If
+            provided, the filename begins with the fingerprint instead of
+            ``prefix`` and ``suffix`` so that the cache is shared by all
+            drivers reading the same images
+
+    Returns:
+        str: cache filename, without extension
+
+    """
+    f = 'pack_n%s_b%s' % (shape[1], shape[0])
+
+    if fingerprint:
+        return fingerprint[:16] + '_' + f
+    return prefix + f + suffix
+
+
+def name_cache_line(y, shape, prefix='', suffix='', fingerprint=None):
     """ Return a filename for a line cache file
 
+    Line caches named by fingerprint are uncompressed, memory mappable NumPy
+    arrays (".npy"). Line caches named by ``prefix`` and ``suffix`` are NumPy
+    zipped arrays (".npz"), as written before caches were named by
+    fingerprint.
+
     Args:
         y (int): row of pixel
         shape (tuple): shape of Y data to save
-        prefix (str, optional): prefix to pixel cache filename
-        suffix (str, optional): suffix to pixel cache filename
+        prefix (str, optional): prefix to line cache filename
+        suffix (str, optional): suffix to line cache filename
+        fingerprint (str, optional): fingerprint of Series image IDs. If
+            provided, the filename begins with the fingerprint instead of
+            ``prefix`` and ``suffix`` so that the cache is shared by all
+            drivers reading the same images
 
     Returns:
-        str: cache filename
+        str: cache filename, ending in ".npy" if named by ``fingerprint``
+            and ".npz" otherwise
 
     """
     f = 'r%s_n%s_b%s' % (y, shape[1], shape[0])
 
+    if fingerprint:
+        return fingerprint[:16] + '_' + f + '.npy'
     return prefix + f + suffix + '.npz'
 
 
+def write_cache_line(filename, series, data):
+    """ Save one row of series data to a NumPy array or zipped array
+
+    The format depends on the extension of ``filename`` (see
+    ``name_cache_line``). Filenames ending in ".npy", used for line caches
+    named by fingerprint, are saved as uncompressed NumPy arrays with each
+    column stored contiguously (ncol x nband x n) so that one column can be
+    read using a memory map (see ``read_cache_line_pixel``). These are
+    validated by their filename. Other filenames are saved as NumPy zipped
+    arrays (nband x n x ncol) along with the image IDs and fingerprint of
+    the Series.
+
+    Args:
+        filename (str): filename of cache file
+        series (Series): Series within timeseries driver to save
+        data (np.ndarray): 3D np.ndarray (nband x n x ncol) of data for the
+            row
+
+    Raises:
+        IOError: raise IOError if it cannot write to cache
+
+    """
+    logger.debug('Caching line to %s' % filename)
+    if filename.endswith('.npy'):
+        np.save(filename, np.ascontiguousarray(np.rollaxis(data, 2)))
+        return
+    np.savez(filename,
+             **{'Y': data,
+                'image_IDs': series.images['id'].astype(str),
+                'fingerprint': np.array(series.fingerprint)})
+
+
 def read_cache_line(filename, series):
     """ Returns data read in from cache file if passes validation
 
@@ -150,10 +235,12 @@ def read_cache_line(filename, series):
     if 'Y' not in z.files or 'image_IDs' not in z.files:
         raise IndexError('Cache file is not in the correct format')
 
+    if 'fingerprint' in z.files:
+        return _check_fingerprint(z, series)
+
     image_IDs = z['image_IDs']
-    dates = np.array([dt.datetime.strptime(s[slice(*series.date_index)],
-                                           series.date_format)
-                      for s in image_IDs])
+    dates = parse_dates([s[slice(*series.date_index)] for s in image_IDs],
+                        series.date_format)
     info = np.array(np.rec.fromarrays([dates, image_IDs],
 					names='dates,image_IDs'))
     sort_idx = np.argsort(info, order='dates')
@@ -165,7 +252,87 @@ def read_cache_line(filename, series):
                          'are not the same' % series.description)
 
 
-def find_files(location, pattern, ignore_dirs=[], maxdepth=float('inf')):
+def read_cache_line_pixel(filename, series, x):
+    """ Returns data for one column of a line cache file if passes validation
+
+    Only column ``x`` is read from memory mapped line caches (".npy"). Line
+    caches saved as NumPy zipped arrays are read entirely.
+
+    Args:
+        filename (str): filename of cache file
+        series (Series): Series within timeseries driver to read
+        x (int): column of pixel
+
+    Returns:
+        np.ndarray: 2D np.ndarray of 'Y' data for series
+
+    Raises:
+        IOError: raise IOError if cache file cannot correctly be read from disk
+        IndexError: raise IndexError if cached data does not match dimensions
+            or images used in timeseries series
+
+    """
+    if not filename.endswith('.npy'):
+        return read_cache_line(filename, series)[..., x]
+
+    Y = np.load(filename, mmap_mode='r')
+    if Y.ndim != 3 or Y.shape[1:] != (series.count, series.n):
+        raise IndexError('Cache file is not in the correct format')
+    if not 0 <= x < Y.shape[0]:
+        raise IndexError('Column %i is not in cache file' % x)
+
+    return np.array(Y[x])
+
+
+def fingerprint_ids(image_IDs, filenames=None, attributes=()):
+    """ Return a hash of an ordered sequence of image IDs
+
+    Image IDs are often the name of the directory containing an image, so
+    different images in the same directories (e.g., stacks matched by
+    another pattern) have the same IDs. Include the filenames and
+    attributes of the images (e.g., band count and data type) so that they
+    are told apart.
+
+    Args:
+        image_IDs (iterable): image IDs, in order
+        filenames (iterable, optional): basenames of each image
+        attributes (iterable, optional): other values describing all images
+
+    Returns:
+        str: hexadecimal SHA-1 digest of the image IDs, filenames, and
+            attributes
+
+    """
+    h = hashlib.sha1()
+    if filenames is None:
+        filenames = [''] * len(image_IDs)
+    for _id, filename in zip(image_IDs, filenames):
+        h.update(str(_id).encode('utf-8'))
+        if filename:
+            h.update(b'\t')
+            h.update(str(filename).encode('utf-8'))
+        h.update(b'\n')
+    for attr in attributes:
+        h.update(b'\0')
+        h.update(str(attr).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _check_fingerprint(z, series):
+    """ Return 'Y' data of a cache file, if written for a Series' images
+
+    Raises IndexError if the cache file was written for other images.
+    """
+    if str(z['fingerprint']) == series.fingerprint:
+        Y = z['Y']
+        if Y.ndim > 1 and Y.shape[1] == series.n:
+            return Y
+    raise IndexError('Could not find cache data for series %s. image_IDs '
+                     'are not the same' % series.description)
+
+
+def find_files(location, pattern, ignore_dirs=[], maxdepth=float('inf'),
+               workers=8):
     """ Find paths to images on disk matching an given pattern
 
     Args:
@@ -173,32 +340,254 @@ def find_files(location, pattern, ignore_dirs=[], maxdepth=float('inf')):
         pattern (str): glob style pattern to search for
         ignore_dirs (iterable): list of directories to ignore from search
         maxdepth (int): maximum depth to recursively search
+        workers (int): number of directories to list concurrently
 
     Returns:
         list: list of files within location matching pattern
 
     """
-    results = []
+    return list(iter_files(location, pattern, ignore_dirs=ignore_dirs,
+                           maxdepth=maxdepth, workers=workers))
+
+
+def iter_files(location, pattern, ignore_dirs=[], maxdepth=float('inf'),
+               workers=8, listdir=None):
+    """ Yield paths to images on disk matching an given pattern as found
+
+    Directories are listed concurrently by a pool of threads, which list
+    directories ahead of those being yielded. Symbolic links to directories
+    are followed. Paths are yielded in a deterministic order: the files of
+    a directory, sorted by name, followed by the files of each of its
+    subdirectories, sorted by name.
+
+    Args:
+        location (str): root directory to search
+        pattern (str): glob style pattern to search for
+        ignore_dirs (iterable): list of directories to ignore from search
+        maxdepth (int): maximum depth to recursively search
+        workers (int): number of directories to list concurrently
+        listdir (callable, optional): function returning the names of
+            subdirectories and of files, each sorted, of a directory
+            (default: ``list_dir``)
 
+    Yields:
+        str: files within location matching pattern
+
+    """
     if isinstance(ignore_dirs, str):
-        ignore_dirs = list(ignore_dirs)
+        ignore_dirs = [ignore_dirs]
+    listdir = listdir or list_dir
+
+    location = os.path.abspath(location)
+    if maxdepth < 1:
+        return
+
+    pool = ThreadPool(max(1, workers))
+    try:
+        # Stack of directories to yield, most recently found last, that
+        # are already being listed by the pool
+        stack = [(location, 1, pool.apply_async(listdir, (location, )))]
+        while stack:
+            root, depth, listing = stack.pop()
+            dirs, files = listing.get()
+
+            for fname in fnmatch.filter(files, pattern):
+                yield os.path.join(root, fname)
+
+            if depth < maxdepth:
+                subdirs = [os.path.join(root, d) for d in dirs
+                           if d not in ignore_dirs]
+                stack.extend(
+                    (path, depth + 1, pool.apply_async(listdir, (path, )))
+                    for path in reversed(subdirs))
+    finally:
+        pool.terminate()
+
+
+def list_dir(path):
+    """ Return names of subdirectories and files of a directory
+
+    Symbolic links to directories are listed as directories. Directories
+    that cannot be listed are treated as empty.
+
+    Args:
+        path (str): directory to list
+
+    Returns:
+        tuple: names of subdirectories and of files, each sorted
+
+    """
+    dirs, files = [], []
+    try:
+        if scandir is not None:
+            for entry in scandir(path):
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dirs if is_dir else files).append(entry.name)
+        else:
+            for name in os.listdir(path):
+                (dirs if os.path.isdir(os.path.join(path, name))
+                 else files).append(name)
+    except OSError as e:
+        logger.debug('Could not list %s: %s' % (path, e))
+        return [], []
+
+    return sorted(dirs), sorted(files)
+
+# DATES
+# Width of, and digit weights for, date directives parsed by `parse_dates`
+_DATE_DIRECTIVES = {
+    '%Y': (1000, 100, 10, 1),
+    '%m': (10, 1),
+    '%d': (10, 1),
+    '%j': (100, 10, 1)
+}
+
+# Ordinal (days since 0001-01-01, plus one) of 1970-01-01
+ORDINAL_EPOCH = 719163
+
+
+def parse_dates(strings, date_format):
+    """ Parse many dates from strings
+
+    Dates in formats made only of year (``%Y``), month (``%m``), day
+    (``%d``), and day of year (``%j``) directives and literal characters
+    (e.g., ``%Y%j`` or ``%Y-%m-%d``) are parsed without creating Python
+    datetime objects when each field is zero-padded to its full width.
+    Other formats, and strings that do not fit that fixed layout (e.g.,
+    ``200001`` for ``%Y%j``), are parsed using ``strptime``.
+
+    Args:
+        strings (iterable): strings containing only a date
+        date_format (str): ``strptime`` format of dates
+
+    Returns:
+        np.ndarray: dates as ``datetime64[us]``, with NaT for strings that
+            could not be parsed
+
+    """
+    strings = list(strings)
+    fields = _date_fields(date_format)
+    if fields is None:
+        return _strptime_dates(strings, date_format)
+
+    width = fields[-1][1]
+    try:
+        chars = np.array(strings, dtype='S%i' % width)
+    except (UnicodeEncodeError, ValueError):
+        return _strptime_dates(strings, date_format)
+    chars = chars.view(np.uint8).reshape(len(strings), width)
+
+    valid = np.array([len(s) == width for s in strings], dtype=np.bool)
+    values = {}
+    for directive, start, end in fields[:-1]:
+        part = chars[:, start:end]
+        if directive in _DATE_DIRECTIVES:
+            digits = part.astype(np.int64) - ord('0')
+            valid &= np.all((digits >= 0) & (digits <= 9), axis=1)
+            values[directive] = digits.dot(_DATE_DIRECTIVES[directive])
+        else:
+            literal = np.frombuffer(directive.encode('ascii'), dtype=np.uint8)
+            valid &= np.all(part == literal, axis=1)
+
+    n = len(strings)
+    # Like `datetime`, there is no year 0
+    valid &= values['%Y'] > 0
+    year = (values['%Y'] - 1970).astype('datetime64[Y]')
+    if '%j' in values:
+        offset = values['%j'] - 1
+        dates = year.astype('datetime64[D]') + offset.astype('timedelta64[D]')
+        # Like `strptime`, day 366 of a non-leap year is the next year
+        valid &= (offset >= 0) & (offset < 366)
+    else:
+        month = values.get('%m', np.ones(n, dtype=np.int64)) - 1
+        day = values.get('%d', np.ones(n, dtype=np.int64)) - 1
+        valid &= (month >= 0) & (month < 12) & (day >= 0)
+        month = (year.astype('datetime64[M]') +
+                 np.clip(month, 0, 11).astype('timedelta64[M]'))
+        dates = month.astype('datetime64[D]') + day.astype('timedelta64[D]')
+        valid &= dates.astype('datetime64[M]') == month
+
+    dates = dates.astype('datetime64[us]')
+    # Let `strptime` decide the dates not parsed as fixed width fields
+    retry = np.where(~valid)[0]
+    if retry.size:
+        dates[retry] = _strptime_dates([strings[i] for i in retry],
+                                       date_format)
+    return dates
+
+
+def _date_fields(date_format):
+    """ Return (directive or literal, start, end) of each field in a format
+
+    The last field is the total width of the format. Returns None if the
+    format contains directives not supported by ``parse_dates``.
+    """
+    fields, i, start = [], 0, 0
+    while i < len(date_format):
+        token = date_format[i:i + 2]
+        if token in _DATE_DIRECTIVES:
+            end = start + len(_DATE_DIRECTIVES[token])
+            i += 2
+        elif token.startswith('%') or ord(token[0]) > 127:
+            return None
+        else:
+            token = token[0]
+            end = start + 1
+            i += 1
+        fields.append((token, start, end))
+        start = end
+
+    directives = [f[0] for f in fields if f[0] in _DATE_DIRECTIVES]
+    if ('%Y' not in directives or len(set(directives)) != len(directives) or
+            ('%j' in directives and len(directives) > 2)):
+        return None
+    fields.append((None, start, start))
+    return fields
+
+
+def _strptime_dates(strings, date_format):
+    dates = np.empty(len(strings), dtype='datetime64[us]')
+    for i, s in enumerate(strings):
+        try:
+            dates[i] = dt.datetime.strptime(s, date_format)
+        except (TypeError, ValueError):
+            dates[i] = np.datetime64('NaT')
+    return dates
 
-    location = os.path.normpath(location)
-    num_sep = location.count(os.path.sep) - 1
 
-    for root, dirs, files in walk(location, followlinks=True):
-        if ignore_dirs:
-            dirs[:] = [d for d in dirs if d not in ignore_dirs]
+def isnat(dates):
+    """ Return True for each date that is not a time (NaT)
 
-        depth = root.count(os.path.sep) - num_sep
-        if depth > maxdepth:
-            dirs[:] = []
-            files[:] = []
+    Same as ``np.isnat``, which requires NumPy 1.13 or newer.
 
-        for fname in fnmatch.filter(files, pattern):
-            results.append(os.path.abspath(os.path.join(root, fname)))
+    Args:
+        dates (np.ndarray): dates as ``datetime64``
+
+    Returns:
+        np.ndarray: True where ``dates`` is NaT
+
+    """
+    dates = np.asarray(dates)
+    return dates.view(np.int64) == np.iinfo(np.int64).min
+
+
+def ordinal_to_datetime64(ordinals):
+    """ Convert ordinal dates to NumPy ``datetime64`` dates
+
+    Args:
+        ordinals (int or np.ndarray): ordinal dates (days since 0001-01-01,
+            plus one), truncated to whole days
+
+    Returns:
+        np.ndarray: dates as ``datetime64[D]``
+
+    """
+    return (np.asarray(ordinals).astype(np.int64) -
+            ORDINAL_EPOCH).astype('datetime64[D]')
 
-    return results
 
 # CONFIGURATION
 
@@ -0,0 +1,370 @@
+""" Pre-populate the cache of a timeseries driver for an area of interest
+
+Example usage::
+
+    python -m tstools.ts_driver.warm_cache /data/p013r030 \\
+        --bbox 300000 4600000 301500 4601500 --processes 8
+
+The area of interest may be a bounding box, the features of a vector file,
+or a list of rows. Pixels within a bounding box or vector features are
+written as pixel caches (or to a pack cache if the driver's "cache_format"
+is "pack") and rows are written as line caches. Cache entries that already
+exist are skipped, so an interrupted run can be resumed by running it
+again. Cache files are written atomically and rows are locked while they
+are cached, so many runs, or TSTools sessions, can share a cache folder.
+
+Drivers are run without QGIS, so only drivers that do not import QGIS
+(e.g., "StackedTimeSeries" or "CCDCTimeSeries") can be used.
+"""
+from __future__ import division, print_function
+
+import argparse
+import ast
+import importlib
+import logging
+from multiprocessing import Pool, util
+import os
+import sys
+import time
+
+import numpy as np
+from osgeo import ogr, osr
+
+from . import ts_utils
+from .cache import FileLock, write_atomic
+from .drivers import DRIVERS
+from .reader import read_window_GDAL
+from ..utils import geo_utils
+
+logger = logging.getLogger('tstools')
+
+# Timeseries driver of each worker process
+_driver = None
+
+# Configuration of worker drivers, which only read images and write cache
+# files. The driver opened by ``main`` tracks cache usage and keeps the
+# catalog, so each worker does not start its own
+_WORKER_CONFIG = {
+    'cache_manager': False,
+    'cache_refresh': 0,
+    'catalog': False,
+    'memory_cache_size': 0
+}
+
+
+def open_driver(name, location, config=None):
+    """ Open a timeseries driver by name
+
+    Args:
+        name (str): name of driver class in ``DRIVERS``
+        location (str): root location of timeseries on disk
+        config (dict, optional): configuration values to replace the
+            driver's default configuration values
+
+    Returns:
+        AbstractTimeSeriesDriver: timeseries driver
+
+    Raises:
+        KeyError: raise KeyError if driver or configuration key is unknown
+
+    """
+    driver = _driver_class(name)
+
+    values = None
+    if config:
+        unknown = set(config) - set(driver.config)
+        if unknown:
+            raise KeyError('Unknown configuration for %s: %s' %
+                           (name, ', '.join(sorted(unknown))))
+        values = [config.get(key, item.value)
+                  for key, item in driver.config.items()]
+
+    return driver(location, config=values)
+
+
+def _driver_class(name):
+    if name not in DRIVERS:
+        raise KeyError('Unknown timeseries driver "%s" (choose from %s)' %
+                       (name, ', '.join(DRIVERS)))
+    import_path = DRIVERS[name].replace('tstools.ts_driver', __package__, 1)
+    return getattr(importlib.import_module(import_path), name)
+
+
+def aoi_tasks(driver, geoms, crs_wkt, cached):
+    """ Return tasks caching pixels within geometries for each Series
+
+    Args:
+        driver (AbstractTimeSeriesDriver): timeseries driver
+        geoms (iterable): geometries of area of interest as Well Known Text
+        crs_wkt (str): Well Known Text (Wkt) Coordinate reference system
+            string describing ``geoms``
+        cached (set): filenames of existing cache entries
+
+    Returns:
+        list: tuples of Series index, row, and columns of pixels to cache
+
+    """
+    tasks = []
+    for i_series, series in enumerate(driver.series):
+        pack = _pack_cache(driver, series)
+        rows = {}
+        for geom_wkt in geoms:
+            geom = geo_utils.reproject_geometry(geom_wkt, crs_wkt, series.crs)
+            try:
+                window = geo_utils.geometry_window(geom, series.gt,
+                                                   series.width,
+                                                   series.height)
+            except IndexError:
+                continue
+            inside = geo_utils.rasterize_geometry(geom, series.gt, window)
+            for i_row, row in enumerate(inside):
+                cols = window[0] + np.where(row)[0]
+                rows.setdefault(window[1] + i_row, set()).update(cols)
+
+        for row in sorted(rows):
+            if pack is not None:
+                cols = [col for col in sorted(rows[row]) if
+                        (row, col) not in pack]
+            else:
+                cols = [col for col in sorted(rows[row]) if
+                        _name_pixel(series, col, row) not in cached]
+            cols = np.array(cols)
+            if cols.size:
+                tasks.append((i_series, row, cols))
+
+    return tasks
+
+
+def row_tasks(driver, rows, cached):
+    """ Return tasks caching entire rows for each Series
+
+    Args:
+        driver (AbstractTimeSeriesDriver): timeseries driver
+        rows (iterable): rows to cache
+        cached (set): filenames of existing cache entries
+
+    Returns:
+        list: tuples of Series index, row, and None (for all columns)
+
+    """
+    tasks = []
+    for i_series, series in enumerate(driver.series):
+        for row in rows:
+            if not 0 <= row < series.height:
+                logger.warning('Row %i is outside of Series "%s"' %
+                               (row, series.description))
+                continue
+            if _name_line(series, row) not in cached:
+                tasks.append((i_series, row, None))
+    return tasks
+
+
+def warm_cache(driver_name, location, tasks, config=None, processes=1):
+    """ Write cache entries for tasks using a pool of processes
+
+    Args:
+        driver_name (str): name of driver class in ``DRIVERS``
+        location (str): root location of timeseries on disk
+        tasks (list): tasks from ``aoi_tasks`` or ``row_tasks``
+        config (dict, optional): configuration values to replace the
+            driver's default configuration values
+        processes (int): number of processes
+
+    Returns:
+        tuple: number of pixels cached and number of bytes read
+
+    """
+    n_pixels, n_bytes = 0, 0
+    start = time.time()
+
+    pool = Pool(processes, initializer=_init_worker,
+                initargs=(driver_name, location, config))
+    try:
+        for i, (_pixels, _bytes) in enumerate(
+                pool.imap_unordered(_warm_task, tasks)):
+            n_pixels += _pixels
+            n_bytes += _bytes
+            elapsed = max(time.time() - start, 1e-6)
+            logger.info('Task %i/%i: cached %i pixels (%.1f pixels/s, '
+                        '%.2f MB/s)' % (i + 1, len(tasks), n_pixels,
+                                        n_pixels / elapsed,
+                                        n_bytes / elapsed / 1e6))
+        # Let workers exit, and close their drivers, normally
+        pool.close()
+        pool.join()
+    finally:
+        pool.terminate()
+
+    return n_pixels, n_bytes
+
+
+def _init_worker(driver_name, location, config):
+    global _driver
+    driver_cls = _driver_class(driver_name)
+    worker_config = dict(config or {})
+    worker_config.update((key, value) for key, value in
+                         _WORKER_CONFIG.items() if key in driver_cls.config)
+    _driver = open_driver(driver_name, location, worker_config)
+    # Close driver when the worker process exits
+    util.Finalize(None, _close_driver, exitpriority=10)
+
+
+def _close_driver():
+    global _driver
+    if _driver is not None:
+        _driver.close()
+    _driver = None
+
+
+def _warm_task(task):
+    """ Read and cache a row, or pixels from a row, of one Series
+    """
+    i_series, row, cols = task
+    series = _driver.series[i_series]
+    cache_folder = os.path.join(_driver.location,
+                                _driver.config['cache_folder'].value)
+
+    if cols is None:
+        # Skip rows cached by another process while waiting for the lock
+        name = _name_line(series, row)
+        filename = os.path.join(cache_folder, name)
+        with FileLock(os.path.join(cache_folder, '.%s.lock' % name)):
+            if os.path.isfile(filename):
+                return 0, 0
+            data = _read_row(series, row, 0, series.width)
+            write_atomic(filename, ts_utils.write_cache_line, series, data)
+        return series.width, data.nbytes
+
+    x0 = int(cols.min())
+    data = _read_row(series, row, x0, int(cols.max()) - x0 + 1)
+    pack = _pack_cache(_driver, series)
+    for col in cols:
+        if pack is not None:
+            pack.write(row, col, data[..., col - x0])
+        else:
+            write_atomic(
+                os.path.join(cache_folder, _name_pixel(series, col, row)),
+                ts_utils.write_cache_pixel, series, data[..., col - x0])
+
+    return cols.size, data.nbytes
+
+
+def _read_row(series, row, x0, xsize):
+    data = np.empty((series.count, series.n, xsize), dtype=series.dtype)
+    for i_img, path in enumerate(series.images['path']):
+        data[:, i_img, :] = read_window_GDAL(path, x0, row, xsize, 1,
+                                             pool=_driver._pool)[:, 0, :]
+    return data
+
+
+def _pack_cache(driver, series):
+    if getattr(driver, '_cache_format', 'npz') != 'pack':
+        return None
+    cache_folder = os.path.join(driver.location,
+                                driver.config['cache_folder'].value)
+    return series._pack_cache(cache_folder)
+
+
+def _name_pixel(series, col, row):
+    return ts_utils.name_cache_pixel(col, row, (series.count, series.n),
+                                     fingerprint=series.fingerprint)
+
+
+def _name_line(series, row):
+    return ts_utils.name_cache_line(row, (series.count, series.n),
+                                    fingerprint=series.fingerprint)
+
+
+def _parse_config(items):
+    config = {}
+    for item in items or []:
+        key, _, value = item.partition('=')
+        try:
+            config[key] = ast.literal_eval(value)
+        except (SyntaxError, ValueError):
+            config[key] = value
+    return config
+
+
+def _read_vector(filename):
+    ds = ogr.Open(filename)
+    if ds is None:
+        raise IOError('Could not open vector file %s' % filename)
+    layer = ds.GetLayer(0)
+    geoms = [feature.GetGeometryRef().ExportToWkt() for feature in layer
+             if feature.GetGeometryRef() is not None]
+    srs = layer.GetSpatialRef()
+    return geoms, srs.ExportToWkt() if srs is not None else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Pre-populate the cache of a timeseries driver')
+    parser.add_argument('location', help='Root location of timeseries')
+    parser.add_argument('--driver', default='StackedTimeSeries',
+                        help='Timeseries driver (default: %(default)s)')
+    parser.add_argument('--config', action='append', metavar='KEY=VALUE',
+                        help='Replace a driver configuration value')
+    aoi = parser.add_mutually_exclusive_group(required=True)
+    aoi.add_argument('--bbox', nargs=4, type=float,
+                     metavar=('MINX', 'MINY', 'MAXX', 'MAXY'),
+                     help='Cache pixels within bounding box')
+    aoi.add_argument('--vector', help='Cache pixels within features')
+    aoi.add_argument('--rows', nargs='+', type=int,
+                     help='Cache entire rows as line caches')
+    parser.add_argument('--crs',
+                        help='Coordinate reference system of bounding box, '
+                             'or of vector file without one (e.g., '
+                             '"EPSG:32619"; default: first Series)')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='Number of processes (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s:%(levelname)s: %(message)s')
+
+    config = _parse_config(args.config)
+    driver = open_driver(args.driver, args.location, config)
+    try:
+        cache_folder = os.path.join(args.location,
+                                    driver.config['cache_folder'].value)
+        if not os.path.isdir(cache_folder):
+            os.makedirs(cache_folder)
+        cached = set(os.listdir(cache_folder))
+
+        if args.rows:
+            tasks = row_tasks(driver, args.rows, cached)
+        else:
+            crs_wkt = driver.series[0].crs
+            if args.crs:
+                srs = osr.SpatialReference()
+                srs.SetFromUserInput(args.crs)
+                crs_wkt = srs.ExportToWkt()
+
+            if args.vector:
+                geoms, vector_crs_wkt = _read_vector(args.vector)
+                crs_wkt = vector_crs_wkt or crs_wkt
+            else:
+                minx, miny, maxx, maxy = args.bbox
+                geoms = ['POLYGON (({0} {1}, {2} {1}, {2} {3}, {0} {3}, '
+                         '{0} {1}))'.format(minx, miny, maxx, maxy)]
+            tasks = aoi_tasks(driver, geoms, crs_wkt, cached)
+
+        logger.info('Caching %i rows of pixels using %i processes' %
+                    (len(tasks), args.processes))
+        start = time.time()
+        n_pixels, n_bytes = warm_cache(args.driver, args.location, tasks,
+                                       config=config,
+                                       processes=args.processes)
+        elapsed = max(time.time() - start, 1e-6)
+        logger.info('Cached %i pixels in %.1fs (%.1f pixels/s, %.2f MB/s)' %
+                    (n_pixels, elapsed, n_pixels / elapsed,
+                     n_bytes / elapsed / 1e6))
+    finally:
+        driver.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
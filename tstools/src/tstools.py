@@ -176,6 +176,7 @@ class TSTools(QtCore.QObject):
         """ Shutdown and disconnect """
         # Disconnect
         self.controller.disconnect()
+        self.controller.close_timeseries()
         tsm.ts = None
         # Remove toolbar icons
         self.iface.removeToolBarIcon(self.action)
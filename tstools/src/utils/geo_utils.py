@@ -1,6 +1,7 @@
 """ Utility functions to deal with spatial data coordinates/etc
 """
-from osgeo import osr, ogr
+import numpy as np
+from osgeo import gdal, osr, ogr
 
 
 def point2pixel(x, y, gt):
@@ -53,6 +54,127 @@ def reproject_point(x, y, from_crs_wkt, to_crs_wkt):
     return point.GetX(), point.GetY()
 
 
+def reproject_points(points, from_crs_wkt, to_crs_wkt):
+    """ Reproject many points to another coordinate reference system
+
+    Args:
+        points (iterable): sequence of (x, y) coordinates in
+            `from_crs_wkt` reference system
+        from_crs_wkt (str): input Coordinate Reference System as
+            Well-Known-Text
+        to_crs_wkt (str): output Coordinate Reference System as Well-Known-Text
+
+    Returns:
+        list: reprojected (x, y) coordinates
+
+    """
+    to_srs = osr.SpatialReference()
+    to_srs.ImportFromWkt(to_crs_wkt)
+    from_srs = osr.SpatialReference()
+    from_srs.ImportFromWkt(from_crs_wkt)
+
+    transform = osr.CoordinateTransformation(from_srs, to_srs)
+
+    out = []
+    for x, y in points:
+        point = ogr.Geometry(ogr.wkbPoint)
+        point.AddPoint(x, y)
+        point.Transform(transform)
+        out.append((point.GetX(), point.GetY()))
+
+    return out
+
+
+def reproject_geometry(geom_wkt, from_crs_wkt, to_crs_wkt):
+    """ Reproject a geometry to another coordinate reference system
+
+    Args:
+        geom_wkt (str): geometry as Well-Known-Text in `from_crs_wkt`
+            reference system
+        from_crs_wkt (str): input Coordinate Reference System as
+            Well-Known-Text
+        to_crs_wkt (str): output Coordinate Reference System as Well-Known-Text
+
+    Returns:
+        ogr.Geometry: reprojected geometry
+
+    """
+    to_srs = osr.SpatialReference()
+    to_srs.ImportFromWkt(to_crs_wkt)
+    from_srs = osr.SpatialReference()
+    from_srs.ImportFromWkt(from_crs_wkt)
+
+    geom = ogr.CreateGeometryFromWkt(geom_wkt)
+    geom.Transform(osr.CoordinateTransformation(from_srs, to_srs))
+
+    return geom
+
+
+def geometry_window(geom, gt, width, height):
+    """ Return the pixel window covering a geometry, clipped to a raster
+
+    Notes:
+      Does not handle images that aren't north up (gt[2] or gt[4] are nonzero)
+
+    Args:
+        geom (ogr.Geometry): geometry in the raster's reference system
+        gt (iterable): geotransform of raster
+        width (int): number of columns in raster
+        height (int): number of rows in raster
+
+    Returns:
+        tuple (int, int, int, int): column and row of upper left pixel, and
+            number of columns and rows of window
+
+    Raises:
+        IndexError: raise IndexError if geometry does not overlap raster
+
+    """
+    minx, maxx, miny, maxy = geom.GetEnvelope()
+    x0, y0 = point2pixel(minx, maxy, gt)
+    x1, y1 = point2pixel(maxx, miny, gt)
+
+    x0, y0 = max(x0, 0), max(y0, 0)
+    x1, y1 = min(x1 + 1, width), min(y1 + 1, height)
+    if x1 <= x0 or y1 <= y0:
+        raise IndexError('Geometry is outside of dataset')
+
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def rasterize_geometry(geom, gt, window):
+    """ Return a mask of the pixels within a window covered by a geometry
+
+    A pixel is covered by the geometry if the center of the pixel is within
+    the geometry.
+
+    Args:
+        geom (ogr.Geometry): geometry in the raster's reference system
+        gt (iterable): geotransform of raster
+        window (tuple): column and row of upper left pixel, and number of
+            columns and rows of window (e.g., from ``geometry_window``)
+
+    Returns:
+        np.ndarray: 2D boolean mask (rows x columns) of window
+
+    """
+    x0, y0, xsize, ysize = window
+
+    ds = gdal.GetDriverByName('MEM').Create('', xsize, ysize, 1, gdal.GDT_Byte)
+    ds.SetGeoTransform((gt[0] + x0 * gt[1] + y0 * gt[2], gt[1], gt[2],
+                        gt[3] + x0 * gt[4] + y0 * gt[5], gt[4], gt[5]))
+
+    vds = ogr.GetDriverByName('Memory').CreateDataSource('')
+    layer = vds.CreateLayer('geometry', geom_type=geom.GetGeometryType())
+    feature = ogr.Feature(layer.GetLayerDefn())
+    feature.SetGeometry(geom)
+    layer.CreateFeature(feature)
+
+    gdal.RasterizeLayer(ds, [1], layer, burn_values=[1])
+
+    return ds.GetRasterBand(1).ReadAsArray().astype(np.bool)
+
+
 def pixel_geometry(gt, px, py):
     """ Return an instance of ogr.Geometry for a pixel at given X/Y coordinate
 